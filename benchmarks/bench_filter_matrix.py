@@ -0,0 +1,56 @@
+"""
+Benchmark the filter matrix of the open positions page against the local replica of the site.
+
+Loads the open positions page once and verifies the job listing of every location/department
+combination of the replica with OpenPositionsPage.run_filter_matrix, reporting combinations per minute.
+
+Usage:
+    python -m benchmarks.bench_filter_matrix --browser chrome --runs 3
+"""
+import argparse
+import itertools
+
+from benchmarks.common import create_driver, print_timings
+from local_site.server import DEPARTMENTS, LOCATIONS, LocalSite
+from pages.open_positions_page import OpenPositionsPage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--api-latency-ms", type=int, default=300,
+                        help="latency of the AJAX endpoints that populate the options and the job list")
+    parser.add_argument("--jobs", type=int, default=64, help="number of postings in the local replica")
+    args = parser.parse_args()
+
+    combinations = list(itertools.product(LOCATIONS, DEPARTMENTS))
+    site = LocalSite(api_latency_ms=args.api_latency_ms, jobs=args.jobs).start()
+    site.apply_environment()
+    driver = create_driver(args.browser)
+    timings, rates, failures, empty = [], [], set(), set()
+    try:
+        page = OpenPositionsPage(driver)
+        for _ in range(args.runs):
+            page.enter()
+            matrix = page.run_filter_matrix(combinations)
+            timings.extend(result["seconds"] for result in matrix["results"])
+            rates.append(matrix["combinations_per_minute"])
+            failures.update(f"{result['location']} / {result['department']}: {result['error']}"
+                            for result in matrix["results"] if result["status"] == "failed")
+            empty.update(f"{result['location']} / {result['department']}"
+                         for result in matrix["results"] if result["status"] == "empty")
+    finally:
+        driver.quit()
+        site.stop()
+
+    print_timings({"combination": timings}, label="step")
+    print(f"combinations per run: {len(combinations)}, "
+          f"combinations per minute: {', '.join(str(rate) for rate in rates)}")
+    print(f"combinations without postings: {len(empty)}")
+    for failure in sorted(failures):
+        print(f"FAILED {failure}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the filter step of the open positions page against the local replica of the site.
+
+Compares the legacy fixed-sleep select2 flow (10s before each dropdown, 2s after both)
+with the condition-driven OpenPositionsPage.apply_filters.
+
+Usage:
+    python -m benchmarks.bench_filters --browser chrome --runs 3
+"""
+import argparse
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+from benchmarks.common import create_driver, print_timings
+from local_site.server import LocalSite
+from pages.open_positions_page import OpenPositionsPage
+
+
+def legacy_apply_filters(page, location, department):
+    """Reproduction of the fixed-sleep filter flow the suite used before the filter engine."""
+    for dropdown_locator, option_text in ((page.LOCATION_FILTER_LOCATOR, location),
+                                          (page.DEPARTMENT_FILTER_LOCATOR, department)):
+        time.sleep(10)
+        page.wait_for_element(dropdown_locator, timeout=15).click()
+        option_locator = (By.XPATH, f"//li[contains(@class, 'select2-results__option') and text()='{option_text}']")
+        page.wait_for_element(option_locator, timeout=15).click()
+    time.sleep(2)
+
+
+def new_apply_filters(page, location, department):
+    page.apply_filters(location, department)
+
+
+def measure(driver, url, apply, runs, location, department):
+    """Load the page `runs` times and return the latency of the filter step for each run."""
+    page = OpenPositionsPage(driver)
+    timings = []
+    for _ in range(runs):
+        driver.get(url)
+        started = time.perf_counter()
+        apply(page, location, department)
+        timings.append(time.perf_counter() - started)
+
+        # Sanity check: the filtered listing must match what the test asserts on
+        jobs = page.get_job_records()
+        assert jobs and not page.find_job_mismatches(jobs, location, department, department), f"Unexpected listing: {jobs}"
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--api-latency-ms", type=int, default=1500,
+                        help="latency of the AJAX endpoints that populate the options and the job list")
+    parser.add_argument("--jobs", type=int, default=30, help="number of postings in the local replica")
+    parser.add_argument("--skip-legacy", action="store_true", help="only measure the new filter engine")
+    args = parser.parse_args()
+
+    site = LocalSite(api_latency_ms=args.api_latency_ms, jobs=args.jobs).start()
+    url = f"{site.base_url}/careers/open-positions/?department=qualityassurance"
+    driver = create_driver(args.browser)
+    try:
+        flows = {"new": new_apply_filters}
+        if not args.skip_legacy:
+            flows = {"legacy": legacy_apply_filters, **flows}
+
+        results = {name: measure(driver, url, apply, args.runs, "Istanbul, Turkey", "Quality Assurance")
+                   for name, apply in flows.items()}
+    finally:
+        driver.quit()
+        site.stop()
+
+    print_timings(results, label="flow")
+    if "legacy" in results:
+        speedup = statistics.mean(results["legacy"]) / statistics.mean(results["new"])
+        print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare browser profiles: page load times and whether the test flow still passes.
+
+Runs every step of test_insider_careers under each profile and reports the mean time to the end of
+DOMContentLoaded and of the load event (from Navigation Timing, so the eager and none strategies, whose
+driver.get returns early, are measured like the others), the total flow time and the steps that failed,
+so the fastest profile that still passes can be chosen.
+
+Usage:
+    python -m benchmarks.bench_profiles --browser chrome --profiles default headless eager lean
+    python -m benchmarks.bench_profiles --local-site
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.bench_steps import STEPS
+from benchmarks.common import create_driver
+from local_site.server import LocalSite
+from utils.browser_profiles import PROFILES, page_loads, summarize_page_loads
+from utils.driver_pool import DriverPool
+
+
+def run_profile(browser, profile, runs):
+    """Run the flow `runs` times under one profile and return (flow times, failed steps)."""
+    driver = create_driver(browser, profile)
+    flow_times, failures = [], set()
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            for name, step in STEPS:
+                try:
+                    step(driver)
+                except Exception as e:
+                    failures.add(f"{name} ({type(e).__name__})")
+            flow_times.append(time.perf_counter() - started)
+            page_loads.finish_all(driver)
+            DriverPool.reset(driver)
+    finally:
+        driver.quit()
+    return flow_times, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--local-site", action="store_true", help="run against the local replica instead of the live site")
+    args = parser.parse_args()
+
+    site = None
+    if args.local_site:
+        site = LocalSite().start()
+        site.apply_environment()
+
+    results = {}
+    try:
+        for profile in args.profiles:
+            results[profile] = run_profile(args.browser, profile, args.runs)
+    finally:
+        if site:
+            site.stop()
+
+    loads = page_loads.to_dict()
+    print(f"{'profile':<10} {'DCL (ms)':>9} {'load (ms)':>10} {'unfinished':>11} {'flow (s)':>9}  result")
+    for profile, (flow_times, failures) in results.items():
+        summary = summarize_page_loads([sample for samples in loads.get(profile, {}).values() for sample in samples])
+        dcl, load = (f"{summary[metric]:.0f}" if summary[metric] is not None else "-"
+                     for metric in ("dom_content_loaded_ms", "load_ms"))
+        result = "passed" if not failures else "failed: " + ", ".join(sorted(failures))
+        print(f"{profile:<10} {dcl:>9} {load:>10} {summary['unfinished']:>11} "
+              f"{statistics.mean(flow_times):>9.3f}  {result}")
+
+
+if __name__ == "__main__":
+    main()
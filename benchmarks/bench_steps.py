@@ -0,0 +1,88 @@
+"""
+Benchmark every step of test_insider_careers against the local replica of the site.
+
+The replica serves the same pages with a fixed, configurable latency, so step timings are
+reproducible and can be compared before and after a change.
+
+Usage:
+    python -m benchmarks.bench_steps --browser chrome --runs 3 --latency-ms 100
+"""
+import argparse
+import time
+
+from benchmarks.common import create_driver, print_timings
+from local_site.server import LocalSite
+from pages.careers_page import CareersPage
+from pages.home_page import HomePage
+from pages.open_positions_page import OpenPositionsPage
+from pages.quality_assurance_page import QualityAssurancePage
+from utils.driver_pool import DriverPool
+
+
+def navigate_to_careers(driver):
+    home_page = HomePage(driver)
+    home_page.open()
+    home_page.go_to_careers()
+
+
+def verify_careers_blocks(driver):
+    careers_page = CareersPage(driver)
+    for block_name, block_result in careers_page.verify_blocks().items():
+        careers_page.verify_block_presence(block_name, block_result)
+
+
+def navigate_to_qa_jobs(driver):
+    qa_page = QualityAssurancePage(driver)
+    qa_page.open()
+    qa_page.click_see_all_qa_jobs()
+
+
+def filter_and_verify_jobs(driver):
+    open_positions_page = OpenPositionsPage(driver)
+    open_positions_page.apply_filters()
+    open_positions_page.verify_jobs()
+
+
+def open_first_job(driver):
+    OpenPositionsPage(driver).open_first_job()
+
+
+STEPS = [
+    ("1. navigate to careers", navigate_to_careers),
+    ("2. verify careers blocks", verify_careers_blocks),
+    ("3. navigate to QA jobs", navigate_to_qa_jobs),
+    ("4. filter and verify jobs", filter_and_verify_jobs),
+    ("5. open first job", open_first_job),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=0, help="latency of every page response")
+    parser.add_argument("--api-latency-ms", type=int, default=None, help="latency of the AJAX endpoints")
+    parser.add_argument("--jobs", type=int, default=30, help="number of postings in the local replica")
+    args = parser.parse_args()
+
+    site = LocalSite(args.latency_ms, args.api_latency_ms, args.jobs).start()
+    site.apply_environment()
+    driver = create_driver(args.browser)
+    results = {name: [] for name, _ in STEPS}
+    try:
+        for _ in range(args.runs):
+            for name, step in STEPS:
+                started = time.perf_counter()
+                step(driver)
+                results[name].append(time.perf_counter() - started)
+            DriverPool.reset(driver)
+    finally:
+        driver.quit()
+        site.stop()
+
+    results["total"] = [sum(timings) for timings in zip(*results.values())]
+    print_timings(results)
+
+
+if __name__ == "__main__":
+    main()
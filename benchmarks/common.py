@@ -0,0 +1,18 @@
+import statistics
+
+from utils import driver_pool
+from utils.browser_profiles import get_profile
+
+
+def create_driver(browser, profile="headless"):
+    """Start a browser for benchmarking (headless by default)."""
+    return driver_pool.create_driver(browser, get_profile(profile))
+
+
+def print_timings(results, label="step"):
+    """Print mean/min/max of each list of timings (in seconds) in `results`."""
+    width = max([len(label)] + [len(name) for name in results])
+    print(f"{label:<{width}} {'runs':>4} {'mean (s)':>10} {'min (s)':>10} {'max (s)':>10}")
+    for name, timings in results.items():
+        print(f"{name:<{width}} {len(timings):>4} {statistics.mean(timings):>10.3f} "
+              f"{min(timings):>10.3f} {max(timings):>10.3f}")
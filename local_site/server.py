@@ -0,0 +1,198 @@
+"""
+Local stand-in for the Insider careers flow and the Lever posting pages.
+
+Serves replicas of the home page (cookie bar, Company menu), the careers page blocks, the QA
+careers page, the open positions page (select2 filters and AJAX-driven #jobs-list) and Lever
+postings, with configurable response latency and job list size.
+
+Usage:
+    python -m local_site.server --port 8000 --latency-ms 100 --jobs 200
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from utils.site import LEVER_URL_ENV, SITE_URL_ENV
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+LOCATIONS = ["Istanbul, Turkey", "London, United Kingdom", "New York, US", "Singapore, Singapore"]
+DEPARTMENTS = ["Quality Assurance", "Software Development", "Sales", "Marketing"]
+
+PAGES = {
+    "/": "home.html",
+    "/careers/": "careers.html",
+    "/careers/quality-assurance/": "quality_assurance.html",
+    "/careers/open-positions/": "open_positions.html",
+}
+
+LEVER_PREFIX = "/lever"
+
+
+def generate_jobs(count):
+    """Build a deterministic list of `count` job postings spread over every location and department."""
+    jobs = []
+    for index in range(count):
+        department = DEPARTMENTS[index % len(DEPARTMENTS)]
+        jobs.append({
+            "id": f"{index + 1:08d}-local",
+            "title": f"{department} Specialist {index + 1}",
+            "department": department,
+            "location": LOCATIONS[(index // len(DEPARTMENTS)) % len(LOCATIONS)],
+        })
+    return jobs
+
+
+def render(template_name, **values):
+    """Read a template and substitute its {{ name }} placeholders."""
+    with open(os.path.join(TEMPLATES_DIR, template_name), encoding="utf-8") as template:
+        content = template.read()
+    for name, value in values.items():
+        content = content.replace("{{ " + name + " }}", str(value))
+    return content
+
+
+class LocalSite:
+    """
+    Threaded HTTP server serving the local replica of the careers flow.
+
+    :param latency_ms: Delay added to every page response.
+    :param api_latency_ms: Delay added to the AJAX endpoints (filters and jobs); defaults to latency_ms.
+    :param jobs: Number of job postings in the data set.
+    :param cookie_bar_delay_ms: Delay before the cookie bar appears on the home page.
+    :param lazy_render_delay_ms: Delay before a lazily loaded careers block renders once scrolled into view.
+    :param page_size: Job postings loaded per page of the infinite-scroll job list (all at once by default).
+    """
+
+    def __init__(self, latency_ms=0, api_latency_ms=None, jobs=30, cookie_bar_delay_ms=300,
+                 lazy_render_delay_ms=200, page_size=None, host="127.0.0.1", port=0):
+        self.latency_ms = latency_ms
+        self.api_latency_ms = latency_ms if api_latency_ms is None else api_latency_ms
+        self.jobs = generate_jobs(jobs)
+        self.cookie_bar_delay_ms = cookie_bar_delay_ms
+        self.lazy_render_delay_ms = lazy_render_delay_ms
+        self.page_size = page_size
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def lever_url(self):
+        return self.base_url + LEVER_PREFIX
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release its port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def apply_environment(self):
+        """Point the page objects at this server (see utils.site.resolve_url)."""
+        os.environ[SITE_URL_ENV] = self.base_url
+        os.environ[LEVER_URL_ENV] = self.lever_url
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def filter_jobs(self, location, department):
+        return [job for job in self.jobs
+                if location in ("", "All", job["location"]) and department in ("", "All", job["department"])]
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+                if url.path == "/api/filters":
+                    return self._send_json({"locations": LOCATIONS, "departments": DEPARTMENTS})
+                if url.path == "/api/jobs":
+                    jobs = site.filter_jobs(query.get("location", ""), query.get("department", ""))
+                    offset = int(query.get("offset", 0))
+                    limit = int(query.get("limit", 0)) or len(jobs)
+                    return self._send_json(jobs[offset:offset + limit])
+                if url.path.startswith(LEVER_PREFIX + "/useinsider/"):
+                    return self._send_posting(url.path.rstrip("/").rsplit("/", 1)[-1])
+                if url.path in PAGES:
+                    return self._send_html(render(
+                        PAGES[url.path],
+                        lever_url=site.lever_url,
+                        cookie_bar_delay=site.cookie_bar_delay_ms,
+                        lazy_render_delay=site.lazy_render_delay_ms,
+                        page_size=site.page_size or 0,
+                    ))
+                self.send_error(404)
+
+            def _send_posting(self, job_id):
+                job = next((job for job in site.jobs if job["id"] == job_id), None)
+                if job is None:
+                    return self.send_error(404)
+                self._send_html(render("lever_posting.html", title=job["title"], department=job["department"],
+                                       location=job["location"], apply_path=f"{self.path.rstrip('/')}/apply"))
+
+            def _send_html(self, content):
+                time.sleep(site.latency_ms / 1000)
+                self._send(content.encode("utf-8"), "text/html; charset=utf-8")
+
+            def _send_json(self, data):
+                time.sleep(site.api_latency_ms / 1000)
+                self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="delay added to every page response")
+    parser.add_argument("--api-latency-ms", type=int, default=None, help="delay added to the AJAX endpoints")
+    parser.add_argument("--jobs", type=int, default=30, help="number of job postings")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help="job postings per page of the infinite-scroll job list (all at once by default)")
+    args = parser.parse_args()
+
+    site = LocalSite(args.latency_ms, args.api_latency_ms, args.jobs, page_size=args.page_size,
+                     host=args.host, port=args.port)
+    print(f"Serving the local Insider replica on {site.base_url} (Lever postings under {site.lever_url})")
+    print(f"Run the tests against it with: {SITE_URL_ENV}={site.base_url} {LEVER_URL_ENV}={site.lever_url} pytest")
+    site.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
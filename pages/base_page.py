@@ -1,38 +1,385 @@
+import itertools
+import json
 import os
 import time
 from datetime import datetime
+from urllib.parse import urlsplit
 import allure
-from selenium.common import TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
+from selenium.common import TimeoutException, WebDriverException
+from utils import adaptive_timeouts, page_performance, screenshots, timing, verification_cache, visual_regression, waits
+from utils.attachments import attach
+from utils.browser_profiles import page_loads
+from utils.parallel import get_worker_id, worker_namespace
+from utils.site import LIVE_SITE_URL, resolve_url
+
+# Per-process counter that keeps screenshot filenames unique within the same microsecond
+_screenshot_sequence = itertools.count()
+
+# Async script used by BasePage.take_centered_screenshot. Arguments: element, timeout (ms).
+# Scrolls the element to the top of the viewport and resolves once the scroll position
+# has been stable for two consecutive checks.
+SCROLL_AND_SETTLE_SCRIPT = """
+const [element, timeoutMs, done] = arguments;
+const started = performance.now();
+element.scrollIntoView({block: 'start'});
+let lastY = window.scrollY;
+let stableFrames = 0;
+function check() {
+    stableFrames = window.scrollY === lastY ? stableFrames + 1 : 0;
+    lastY = window.scrollY;
+    if (stableFrames >= 2 || performance.now() - started > timeoutMs) return done();
+    setTimeout(check, 50);
+}
+setTimeout(check, 50);
+"""
+
+# Async script used by BasePage.apply_select_filters. Arguments: {select CSS selector: option text},
+# results container CSS selector, timeout (ms), quiet period (ms), idle period (ms).
+# Requests started by the page (XMLHttpRequest, which jQuery uses, and fetch) are counted, so a list
+# that is cleared or shows a loader while its AJAX response is pending is not taken for the new results.
+# Resolves once new nodes have been added to the results container after the change, no request is
+# pending and the container has been quiet for the quiet period. A change that renders no new nodes,
+# such as an empty listing followed by another empty one, resolves with replaced=false once no request
+# has been pending and the container has not changed for the idle period.
+APPLY_SELECT_FILTERS_SCRIPT = """
+const [filters, resultsSelector, timeoutMs, quietMs, idleMs, done] = arguments;
+const started = performance.now();
+const selectors = Object.keys(filters);
+
+if (!window.__pageRequests) {
+    const requests = window.__pageRequests = {pending: 0};
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        requests.pending++;
+        // Counted as finished before the page's own load handlers run, so the results they render count
+        const finished = () => {
+            if (this.readyState !== 4) return;
+            requests.pending--;
+            this.removeEventListener('readystatechange', finished);
+        };
+        this.addEventListener('readystatechange', finished);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            requests.pending++;
+            return fetch.apply(window, arguments).finally(() => requests.pending--);
+        };
+    }
+}
+const requests = window.__pageRequests;
+
+function findOption(selector) {
+    const select = document.querySelector(selector);
+    if (!select) return null;
+    return Array.from(select.options).find(o => o.text.trim() === filters[selector]) || null;
+}
+
+function finish(extra) {
+    done(Object.assign({
+        applied: {}, missing: [], mutations: 0, replaced: false, timed_out: false,
+        elapsed_ms: Math.round(performance.now() - started)
+    }, extra));
+}
+
+function applyAll() {
+    const applied = {};
+    let changed = false;
+    for (const selector of selectors) {
+        const select = document.querySelector(selector);
+        const option = findOption(selector);
+        if (select.value !== option.value) {
+            select.value = option.value;
+            changed = true;
+            if (window.jQuery) {
+                window.jQuery(select).trigger('change');
+            } else {
+                select.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+        }
+        applied[selector] = option.text.trim();
+    }
+    return {applied, changed};
+}
+
+function waitForOptions() {
+    const missing = selectors.filter(s => !findOption(s));
+    if (!missing.length) return observeResults();
+    if (performance.now() - started > timeoutMs) return finish({missing});
+    setTimeout(waitForOptions, 50);
+}
+
+function observeResults() {
+    const container = document.querySelector(resultsSelector);
+    let mutations = 0;
+    let replaced = false;
+    let lastChange = performance.now();
+    let checkTimer = null;
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastChange = performance.now();
+        // Removed nodes or a loader alone do not count: the results are in once nodes arrive
+        // while no request is pending any more
+        if (records.some(r => r.addedNodes.length) && !requests.pending) replaced = true;
+    });
+    const deadline = setTimeout(() => {
+        observer.disconnect();
+        clearTimeout(checkTimer);
+        finish({applied, mutations, replaced, timed_out: true});
+    }, Math.max(timeoutMs - (performance.now() - started), 0));
+
+    function check() {
+        if (requests.pending) lastChange = performance.now();
+        if (performance.now() - lastChange >= (replaced ? quietMs : idleMs)) return settle();
+        checkTimer = setTimeout(check, 50);
+    }
+
+    function settle() {
+        observer.disconnect();
+        clearTimeout(deadline);
+        finish({applied, mutations, replaced});
+    }
+
+    if (container) {
+        observer.observe(container, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    const {applied, changed} = applyAll();
+    if (!container || !changed) return settle();
+    check();
+}
+
+waitForOptions();
+"""
+
+# Script used by BasePage.start_select_filters: starts APPLY_SELECT_FILTERS_SCRIPT without waiting for it.
+# Same arguments without the callback; the result is kept on the window for select_filters_result.
+START_SELECT_FILTERS_SCRIPT = """
+const args = Array.from(arguments);
+window.__selectFiltersResult = null;
+(function () {
+""" + APPLY_SELECT_FILTERS_SCRIPT + """
+}).apply(null, args.concat([result => { window.__selectFiltersResult = result; }]));
+"""
 
 
 class BasePage:
+    URL = None  # Live URL of the page, set by the page objects that can be opened directly
+
+    # Canonical entry state used by enter(): the URL to load (defaults to URL, may carry filter
+    # parameters) and the cookies injected before the first load. The consent cookies set by the
+    # CookieLawInfo banner keep it from showing up on every Insider page.
+    ENTRY_URL = None
+    ENTRY_COOKIES = (
+        {"name": "viewed_cookie_policy", "value": "yes"},
+        {"name": "cookielawinfo-checkbox-necessary", "value": "yes"},
+    )
+
+    # Performance budget checked after every load of the page: {metric: maximum} with timings in
+    # milliseconds (see utils.page_performance.METRICS). Page objects override it with their own budget.
+    PERFORMANCE_BUDGET = {
+        "ttfb_ms": 1500,
+        "dom_content_loaded_ms": 5000,
+        "load_ms": 10000,
+        "transfer_bytes": 10_000_000,
+        "request_count": 250,
+    }
+
     def __init__(self, driver):
         """
         Initialize the BasePage with the provided driver instance and create a directory for screenshots.
+        Parallel workers get their own screenshot directory so their files never collide.
         """
         self.driver = driver
-        self.screenshot_dir = "Screenshots"
+        self.screenshot_dir = worker_namespace("Screenshots")
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
-    def wait_for_element(self, locator, timeout=10):
+    def open_url(self, url):
+        """
+        Open a page on the configured site and record its load timings for the current browser profile.
+
+        :param url: Live URL of the page (rewritten by utils.site.resolve_url).
+        """
+        page_loads.finish(self.driver)  # The current page is about to be left
+        self.driver.get(resolve_url(url))
+        page_loads.track(self.driver, url, resolve_url(url))
+        self.collect_performance()
+
+    def enter(self):
+        """
+        Open the page directly in its canonical entry state, skipping the click-through that leads
+        to it: the entry cookies are injected before the first load and ENTRY_URL is opened.
+        """
+        url = self.ENTRY_URL or self.URL
+        if self.ENTRY_COOKIES:
+            self.seed_cookies(url, self.ENTRY_COOKIES)
+        self.open_url(url)
+
+    def start_enter(self):
+        """
+        Start opening the page in its canonical entry state without waiting for the load, so that
+        other tabs of the session can be driven meanwhile. Poll is_entered() to find out when it is loaded.
+        """
+        url = self.ENTRY_URL or self.URL
+        page_loads.finish(self.driver)
+        if self.ENTRY_COOKIES:
+            self.seed_cookies(url, self.ENTRY_COOKIES)
+        # The marker lives on the window of the current document only, so it disappears with the navigation
+        self.driver.execute_script("window.__pageLeaving = true; window.location.assign(arguments[0]);",
+                                   resolve_url(url))
+
+    def is_entered(self):
+        """
+        :return: True once the document opened by start_enter has finished loading.
+        """
+        entered = self.driver.execute_script("return !window.__pageLeaving && document.readyState === 'complete';")
+        if entered:
+            url = self.ENTRY_URL or self.URL
+            page_loads.track(self.driver, url, resolve_url(url))
+            self.collect_performance()
+        return entered
+
+    def collect_performance(self, page=None, budget=None):
+        """
+        Collect Navigation Timing, Resource Timing and paint metrics of the loaded document in one script call,
+        check them against the performance budget and attach both to the report.
+
+        :param page: Name the metrics are recorded under (the page object class by default), keyed by
+                     site and browser like wait_key so runs on the replica or in another browser stay apart.
+        :param budget: Budget to check (PERFORMANCE_BUDGET by default).
+        :return: List of budget violations, or None if collection is disabled or failed.
+        """
+        if not page_performance.recorder.enabled:
+            return None
+        metrics = page_performance.collect(self.driver)
+        if metrics is None:
+            return None
+        page = self.wait_key(page or type(self).__name__)
+        violations = page_performance.check_budget(metrics, self.PERFORMANCE_BUDGET if budget is None else budget)
+        test = os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" (", 1)[0] or None
+        page_performance.recorder.record(page, metrics, violations, test)
+        attach(json.dumps({"page": page, "metrics": metrics, "violations": violations}, indent=2),
+               name=f"Page Performance: {page}" + (f" ({len(violations)} budget violations)" if violations else ""),
+               attachment_type=allure.attachment_type.JSON)
+        return violations
+
+    def verification_key(self, scope):
+        """
+        Key of a verification in the verification cache: browser, site the page is served from and scope.
+
+        :param scope: What is verified, including its parameters (e.g. the applied filters).
+        """
+        return f"{self.driver.name}|{resolve_url(self.URL or '')}|{scope}"
+
+    def skip_unchanged(self, key, fingerprint, skipped):
+        """
+        Look up a verification in the verification cache and report it as skipped when the DOM
+        fingerprint is unchanged since the last passing run (incremental mode only).
+
+        :param key: Key from verification_key().
+        :param fingerprint: Fingerprint of the verified DOM computed by the page object.
+        :param skipped: Description of the checks that are skipped.
+        :return: Data stored by the last passing verification, or None if a full verification is needed.
+        """
+        cache = verification_cache.get_cache()
+        cached = cache.lookup(key, fingerprint)
+        if cached is not None:
+            cache.record_skip(key, skipped)
+            attach(f"Unchanged since the last passing run (fingerprint {fingerprint}); skipped: {skipped}",
+                   name="Incremental Verification")
+        return cached
+
+    def seed_cookies(self, url, cookies):
+        """
+        Inject cookies for the site of a page before it is loaded.
+        Chrome sets them through CDP without a page load; other browsers first open a lightweight
+        document on the same origin, as WebDriver only adds cookies for the current domain.
+
+        :param url: Live URL of the page (rewritten by utils.site.resolve_url).
+        :param cookies: Cookie dictionaries with at least a name and a value.
+        """
+        target = resolve_url(url)
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            for cookie in cookies:
+                self.driver.execute_cdp_cmd("Network.setCookie", {"path": "/", **cookie, "url": target})
+            return
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(target))
+        if not self.driver.current_url.startswith(origin):
+            self.driver.get(origin + "/robots.txt")
+        for cookie in cookies:
+            self.driver.add_cookie({"path": "/", **cookie})
+
+    def wait_key(self, name):
+        """
+        Key of a named wait in the latency history (or of a page in the performance history): site the tests
+        run against, browser and name, so measurements on the local replica or in another browser never
+        shape the timeouts or trends of other runs.
+        """
+        return f"{resolve_url(LIVE_SITE_URL)}|{self.driver.name}|{name}"
+
+    def wait_for_element(self, locator, timeout=10, name=None):
         """
         Waits for an element to become visible within the specified timeout.
 
         :param locator: Locator for the target element.
-        :param timeout: Maximum wait time (in seconds).
+        :param timeout: Default maximum wait time (in seconds), replaced by the learned timeout once known.
+        :param name: Name of the wait in the latency history (derived from the page and locator by default).
         :return: Web element if found within the timeout.
         """
+        return self.wait_for_any([locator], timeout, name)[1]
+
+    def wait_for_any(self, locators, timeout=10, name=None):
+        """
+        Waits until any of the locators matches a visible element, using the event-driven wait engine.
+
+        :param locators: List of locators to wait for.
+        :param timeout: Default maximum wait time (in seconds), replaced by the learned timeout once known.
+        :param name: Name of the wait in the latency history (derived from the page and locators by default).
+        :return: Tuple (index of the locator that fired first, web element).
+        """
+        name = self.wait_key(name or f"{type(self).__name__}:{' | '.join(locator[1] for locator in locators)}")
+        timeout = adaptive_timeouts.resolve_timeout(name, timeout)
+        started = time.perf_counter()
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            result = waits.wait_for_any(self.driver, locators, timeout)
+            adaptive_timeouts.record(name, time.perf_counter() - started)
+            return result
         except TimeoutException:
-            allure.attach(f"Element with locator {locator} was not found within {timeout} seconds.",
-                          name="Wait for Element Timeout", attachment_type=allure.attachment_type.TEXT)
+            locator_text = locators[0] if len(locators) == 1 else locators
+            attach(f"Element with locator {locator_text} was not found within {timeout:.1f} seconds.",
+                   name="Wait for Element Timeout", attachment_type=allure.attachment_type.TEXT)
             raise
+        finally:
+            timing.record_wait(time.perf_counter() - started)
+
+    def wait_until(self, name, condition, timeout=10, message=""):
+        """
+        Polls a condition that cannot be observed in-page (e.g. a new window) with an adaptive timeout.
+
+        :param name: Name of the wait in the latency history.
+        :param condition: Callable receiving the driver and returning a truthy value when satisfied.
+        :param timeout: Default maximum wait time (in seconds), replaced by the learned timeout once known.
+        :param message: Message of the TimeoutException raised when the condition is not met.
+        :return: The truthy value returned by the condition.
+        """
+        name = self.wait_key(name)
+        timeout = adaptive_timeouts.resolve_timeout(name, timeout)
+        started = time.perf_counter()
+        try:
+            result = waits.wait_until(self.driver, condition, timeout, message)
+            adaptive_timeouts.record(name, time.perf_counter() - started)
+            return result
+        finally:
+            timing.record_wait(time.perf_counter() - started)
+
+    @staticmethod
+    def pause(seconds):
+        """
+        Sleep for a fixed time; the pause is accounted to the running steps in the timing report.
+
+        :param seconds: Time to sleep (in seconds).
+        """
+        timing.sleep(seconds)
 
     @allure.step("Scrolling element into view and taking centered screenshot")
     def take_centered_screenshot(self, name, locator, browser_name=None):
@@ -42,75 +389,169 @@ class BasePage:
         :param name: Name for the screenshot file.
         :param locator: Locator of the element to scroll into view.
         :param browser_name: Optional, name of the browser to store screenshots separately by browser.
-        :return: File path of the saved screenshot.
+        :return: PNG bytes of the screenshot.
         """
         try:
-            # Locate and scroll element into view
+            # Locate and scroll element into view, then wait until the scroll position has settled
             element = self.wait_for_element(locator)
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'start'});", element)
-            time.sleep(1)  # Brief pause for element to settle
+            self.driver.execute_async_script(SCROLL_AND_SETTLE_SCRIPT, element, 1000)
 
             # Take the screenshot
             return self.take_screenshot(name, browser_name)
         except TimeoutException:
-            allure.attach(f"Element for screenshot not found: {locator}", name="Screenshot Error",
-                          attachment_type=allure.attachment_type.TEXT)
+            attach(f"Element for screenshot not found: {locator}", name="Screenshot Error",
+                   attachment_type=allure.attachment_type.TEXT)
             raise
 
+    def compare_with_baseline(self, name, locator, masks=()):
+        """
+        Scrolls an element into view, captures it and compares the capture with its visual baseline.
+        The capture, the diff image and the similarity score are attached to the report.
+
+        :param name: Name of the baseline (stored per browser).
+        :param locator: Locator of the element to capture.
+        :param masks: Regions of the element to ignore, as (x, y, width, height) fractions of its size.
+        :return: Comparison result (see utils.visual_regression), or None when visual regression is disabled.
+        :raises AssertionError: If the capture differs from the baseline beyond the similarity threshold.
+        """
+        store = visual_regression.get_store()
+        if store is None:
+            return None
+        element = self.wait_for_element(locator)
+        self.driver.execute_async_script(SCROLL_AND_SETTLE_SCRIPT, element, 1000)
+        png = element.screenshot_as_png
+
+        started = time.perf_counter()
+        result = store.check(self.driver.capabilities.get("browserName", "default"), name, png, masks)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        allure.attach(png, name=f"Visual Capture: {name}", attachment_type=allure.attachment_type.PNG)
+        if result["baseline_created"]:
+            attach(f"New baseline stored at {result['baseline']}", name=f"Visual Baseline: {name}")
+            return result
+
+        if result["diff_png"] is not None:
+            allure.attach(result["diff_png"], name=f"Visual Diff: {name}", attachment_type=allure.attachment_type.PNG)
+        changed_pixels = "not counted" if result["changed_pixels"] is None else result["changed_pixels"]
+        summary = (f"Similarity: {result['similarity']:.4f} (threshold {store.threshold})\n"
+                   f"Changed pixels: {changed_pixels}\n"
+                   f"Hash distance: {result['hash_distance']}/{result['hash_bits']}, "
+                   f"mean difference: {result['mean_difference']}, size changed: {result['size_changed']}\n"
+                   f"Compared in {elapsed_ms:.1f} ms (decided by the {result['stage']} stage)")
+        attach(summary, name=f"Visual Similarity: {name}")
+        if not result["passed"]:
+            if result["stage"] == "layout":
+                reason = f"layout changed (similarity at most {result['similarity']:.4f})"
+            else:
+                reason = f"similarity {result['similarity']:.4f} below {store.threshold}"
+            raise AssertionError(f"Visual regression for '{name}': {reason}"
+                                 + (", size changed" if result["size_changed"] else ""))
+        return result
+
     def take_screenshot(self, name, browser_name=None):
         """
-        Captures a screenshot with a timestamped filename, saved in a browser-specific subdirectory.
+        Captures a screenshot and attaches it to the Allure report.
+
+        The PNG bytes are returned right away; storing the file under a unique timestamped name in a
+        browser-specific subdirectory happens on the background screenshot pipeline. A capture identical
+        to an earlier one is not stored or attached again.
 
         :param name: Name for the screenshot file.
         :param browser_name: Optional, name of the browser to organize screenshots.
-        :return: File path of the saved screenshot.
+        :return: PNG bytes of the screenshot, or None if it could not be captured.
         """
+        try:
+            png = self.driver.get_screenshot_as_png()
+        except WebDriverException as e:
+            attach(f"Screenshot '{name}' could not be captured: {e.msg}", name="Screenshot Error",
+                   attachment_type=allure.attachment_type.TEXT)
+            return None
+
         # Use 'default' if browser name isn't provided
         if not browser_name:
             browser_name = self.driver.capabilities.get('browserName', 'default')
 
-        # Create a subdirectory for the specified browser
-        browser_dir = os.path.join(self.screenshot_dir, browser_name)
-        os.makedirs(browser_dir, exist_ok=True)
+        # Generate a unique filename with a microsecond timestamp, worker id and per-process sequence number
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filename = os.path.join(self.screenshot_dir, browser_name,
+                                f"{name}_{timestamp}_{get_worker_id()}_{next(_screenshot_sequence)}.png")
+
+        # Hand the capture to the pipeline and attach it to the Allure report unless it is a duplicate
+        original = screenshots.get_pipeline().submit(png, filename)
+        if original:
+            attach(f"Screenshot '{name}' is identical to {original}", name=f"Screenshot: {name}",
+                   attachment_type=allure.attachment_type.TEXT)
+        else:
+            allure.attach(png, name=f"Screenshot: {name}", attachment_type=allure.attachment_type.PNG)
+        return png
 
-        # Generate a unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(browser_dir, f"{name}_{timestamp}.png")
+    @allure.step("Apply select2 filters and wait for results to re-render")
+    def apply_select_filters(self, filters, results_locator, timeout=15, quiet_period=0.3, idle_period=1.0):
+        """
+        Apply several select2-backed filters in a single script round trip.
 
-        # Save and attach screenshot to Allure report
-        if self.driver.save_screenshot(filename):
-            allure.attach.file(filename, name=f"Screenshot: {name}", attachment_type=allure.attachment_type.PNG)
-            return filename
-        return None
+        The script waits in-page until every underlying <select> has the requested option,
+        selects them all, and resolves once new results have been rendered into the container:
+        nodes added after the page's requests have finished, followed by the quiet period. When the
+        change renders nothing new (e.g. from one empty listing to another), it resolves once the page
+        has had no pending request and no change in the container for the idle period.
 
-    @allure.step("Select option '{option_text}' from dropdown")
-    def select_dropdown_option(self, dropdown_locator, option_text, option_timeout=15):
+        :param filters: Mapping of <select> CSS selector to the visible option text to select.
+        :param results_locator: CSS locator of the container re-rendered by the filters.
+        :param timeout: Default maximum time (in seconds) for options to load and results to settle,
+                        replaced by the learned timeout once known.
+        :param quiet_period: Time (in seconds) without DOM mutations after the new results arrive that marks
+                             the re-render as finished.
+        :param idle_period: Time (in seconds) without requests or DOM mutations after which a change that
+                            rendered no new results is considered finished.
+        :return: Dictionary with the applied filters, mutation count, whether the results were replaced
+                 and elapsed time in milliseconds.
         """
-        Select an option from a dropdown by visible text, with a fixed delay to ensure elements are loaded.
+        name = self.wait_key("select_filters")
+        timeout = adaptive_timeouts.resolve_timeout(name, timeout)
+        waits.ensure_script_timeout(self.driver, timeout + 5)
+        result = self.driver.execute_async_script(
+            APPLY_SELECT_FILTERS_SCRIPT, dict(filters), results_locator[1],
+            int(timeout * 1000), int(quiet_period * 1000), int(idle_period * 1000)
+        )
+        return self._select_filters_settled(name, timeout, result)
 
-        :param dropdown_locator: Locator for the dropdown element.
-        :param option_text: Text of the option to select from the dropdown.
-        :param option_timeout: Maximum time to wait for the options to appear.
+    def start_select_filters(self, filters, results_locator, timeout=15, quiet_period=0.3, idle_period=1.0):
         """
-        try:
-            # Step 1: Wait for 10 seconds to ensure dropdown options are fully loaded
-            time.sleep(10)
+        Start apply_select_filters without waiting for the results, so that other tabs of the session can be
+        driven while the filter requests are pending. Poll select_filters_result() to find out when they settled.
+        Takes the same parameters as apply_select_filters.
+        """
+        name = self.wait_key("select_filters")
+        timeout = adaptive_timeouts.resolve_timeout(name, timeout)
+        self._pending_select_filters = (name, timeout)
+        self.driver.execute_script(
+            START_SELECT_FILTERS_SCRIPT, dict(filters), results_locator[1],
+            int(timeout * 1000), int(quiet_period * 1000), int(idle_period * 1000)
+        )
 
-            # Step 2: Click on the dropdown after ensuring options are loaded
-            dropdown = self.wait_for_element(dropdown_locator, timeout=option_timeout)
-            dropdown.click()
+    def select_filters_result(self):
+        """
+        :return: Result of the filters started by start_select_filters (see apply_select_filters) once the
+                 results have settled, or None while they are pending.
+        :raises TimeoutException: If the options or the results did not appear within the timeout.
+        """
+        result = self.driver.execute_script("return window.__selectFiltersResult;")
+        if result is None:
+            return None
+        return self._select_filters_settled(*self._pending_select_filters, result)
 
-            # Step 3: Locate and click the desired option
-            option_locator = (By.XPATH, f"//li[contains(@class, 'select2-results__option') and text()='{option_text}']")
-            option = self.wait_for_element(option_locator, timeout=option_timeout)
-            option.click()
+    def _select_filters_settled(self, name, timeout, result):
+        if result["missing"] or result["timed_out"]:
+            error_message = (f"Filters were not applied within {timeout:.1f} seconds. "
+                             f"Missing options: {result['missing']}; results settled: {not result['timed_out']}")
+            self.take_screenshot("select_filters_timeout")
+            attach(error_message, name="Filter Application Timeout",
+                   attachment_type=allure.attachment_type.TEXT)
+            raise TimeoutException(error_message)
 
-            allure.attach(f"Selected option: {option_text}", name="Dropdown Option Selection",
-                          attachment_type=allure.attachment_type.TEXT)
-        except TimeoutException:
-            # Capture error details with a screenshot and Allure message if option selection fails
-            error_message = f"Option '{option_text}' not found in dropdown after waiting {option_timeout} seconds."
-            self.take_screenshot("dropdown_option_not_found")
-            allure.attach(error_message, name="Dropdown Option Selection Error",
-                          attachment_type=allure.attachment_type.TEXT)
-            raise
+        adaptive_timeouts.record(name, result["elapsed_ms"] / 1000)
+        attach(f"Applied filters: {result['applied']}\n"
+               f"Results mutations: {result['mutations']}, replaced: {result['replaced']}\n"
+               f"Elapsed: {result['elapsed_ms']} ms",
+               name="Select Filters", attachment_type=allure.attachment_type.TEXT)
+        return result
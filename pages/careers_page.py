@@ -1,12 +1,116 @@
+import time
 import allure
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.base_page import BasePage
+from utils import adaptive_timeouts, verification_cache, visual_regression, waits
+from utils.attachments import attach
+
+# Async script used by CareersPage.verify_blocks. Arguments: {block name: {selector, header_tag}}, timeout (ms).
+# Resolves with {block name: {found, actual_name}} once every block has a header, or on timeout.
+FIND_BLOCKS_SCRIPT = """
+const [blocks, timeoutMs, done] = arguments;
+const names = Object.keys(blocks);
+let finished = false;
+
+function read() {
+    const results = {};
+    for (const name of names) {
+        const block = document.querySelector(blocks[name].selector);
+        const header = block && block.querySelector(blocks[name].header_tag);
+        results[name] = {found: !!block, actual_name: header ? header.innerText.trim() : ""};
+    }
+    return results;
+}
+
+function complete(results) {
+    return names.every(name => results[name].actual_name);
+}
+
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(deadline);
+    done(read());
+}
+
+// Every DOM change may have rendered a missing block: re-check on mutations
+const observer = new MutationObserver(() => { if (complete(read())) finish(); });
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+const deadline = setTimeout(finish, timeoutMs);
+
+function quietFor(quietMs) {
+    return new Promise(resolve => {
+        let timer = setTimeout(done, quietMs);
+        const waiter = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(done, quietMs); });
+        waiter.observe(document.body, {childList: true, subtree: true});
+        function done() { waiter.disconnect(); resolve(); }
+    });
+}
+
+function nextMutationOrQuiet(quietMs) {
+    return new Promise(resolve => {
+        const waiter = new MutationObserver(() => { waiter.disconnect(); resolve(); });
+        waiter.observe(document.body, {childList: true, subtree: true});
+        setTimeout(() => { waiter.disconnect(); resolve(); }, quietMs);
+    });
+}
+
+async function triggerLazyLoading() {
+    // Blocks that exist but have no header yet: bring each one into view
+    for (const name of names) {
+        const block = document.querySelector(blocks[name].selector);
+        if (finished || !block || read()[name].actual_name) continue;
+        block.scrollIntoView({block: 'start'});
+        await nextMutationOrQuiet(150);
+    }
+    // Blocks that do not exist yet: sweep the page one viewport at a time
+    let position = 0;
+    while (!finished && position < document.documentElement.scrollHeight) {
+        position += window.innerHeight;
+        window.scrollTo(0, position);
+        await nextMutationOrQuiet(150);
+    }
+    // Whole page swept: give pending renders a moment, then report whatever was found
+    await quietFor(1000);
+    finish();
+}
+
+if (complete(read())) {
+    finish();
+} else {
+    triggerLazyLoading();
+}
+"""
+
+# Script used by CareersPage.verify_blocks. Arguments: {block name: {selector, header_tag}}.
+# Returns the fingerprint of the block headers as currently rendered, without scrolling or waiting,
+# or null while any block is missing or has no header yet (e.g. not lazily rendered so far).
+BLOCKS_FINGERPRINT_SCRIPT = verification_cache.FINGERPRINT_FUNCTION + """
+const blocks = arguments[0];
+const headers = Object.keys(blocks).sort().map(name => {
+    const block = document.querySelector(blocks[name].selector);
+    const header = block && block.querySelector(blocks[name].header_tag);
+    return [name, header ? header.innerText.trim() : ''];
+});
+if (headers.some(([name, text]) => !text)) return null;
+return fingerprint(headers.map(([name, text]) => name + '=' + text).join('\\n'));
+"""
 
 
 class CareersPage(BasePage):
     URL = "https://useinsider.com/careers/"
 
+    # The careers page embeds videos and image galleries, hence the larger transfer budget
+    PERFORMANCE_BUDGET = {
+        "ttfb_ms": 1500,
+        "dom_content_loaded_ms": 5000,
+        "load_ms": 10000,
+        "transfer_bytes": 15_000_000,
+        "request_count": 250,
+    }
+
     EXPECTED_BLOCKS = {
         "teams": {
             "locator": (By.CSS_SELECTOR, "#career-find-our-calling"),
@@ -16,79 +120,136 @@ class CareersPage(BasePage):
         "locations": {
             "locator": (By.CSS_SELECTOR, "#career-our-location"),
             "expected_name": "Locations",
-            "header_tag": "h3"
+            "header_tag": "h3",
+            "visual_masks": [(0, 0.3, 1, 0.7)]  # City image slider below the header
         },
         "life_at_insider": {
             "locator": (By.CSS_SELECTOR, "section.elementor-section:nth-child(6)"),
             "expected_name": "Life at Insider",
-            "header_tag": "h2"
+            "header_tag": "h2",
+            "visual_masks": [(0, 0.25, 1, 0.75)]  # Photo carousel below the header
         },
     }
 
     def open(self):
         """Open the Careers page directly and wait until it is fully loaded."""
-        self.driver.get(self.URL)
+        self.open_url(self.URL)
         self.wait_for_element((By.TAG_NAME, "body"))  # Ensure page is fully loaded
 
+    @allure.step("Locate careers blocks and read their headers in one pass")
+    def verify_blocks(self, block_names=None, timeout=10):
+        """
+        Locate every requested block and read its header text with a single in-page script.
+
+        Blocks that are not rendered yet are lazy-loaded by scrolling them (or, if absent, the
+        page one viewport at a time) into view; DOM mutations trigger a re-check, so the script
+        resolves as soon as every block is found instead of after fixed retry intervals.
+
+        In incremental mode, the block lookup is skipped when the fingerprint of the block headers
+        is unchanged since the last passing run, and the results of that run are returned instead.
+        Lazily rendered blocks have no fingerprint before the lookup, so that case always runs in full;
+        the fingerprint stored for the next run is taken after the lookup has resolved.
+
+        :param block_names: Names from EXPECTED_BLOCKS to verify (defaults to all of them).
+        :param timeout: Default maximum time (in seconds) for all blocks to appear,
+                        replaced by the learned timeout once known.
+        :return: Dictionary of block name to result (found, name_mismatch, actual_name, expected_name).
+        """
+        block_names = list(block_names or self.EXPECTED_BLOCKS)
+        unknown = [name for name in block_names if name not in self.EXPECTED_BLOCKS]
+        if unknown:
+            raise ValueError(f"No configuration found for blocks: {unknown}")
+
+        blocks = {name: {"selector": self.EXPECTED_BLOCKS[name]["locator"][1],
+                         "header_tag": self.EXPECTED_BLOCKS[name]["header_tag"]}
+                  for name in block_names}
+        key = self.verification_key("blocks:" + ",".join(block_names))
+        fingerprint = self.driver.execute_script(BLOCKS_FINGERPRINT_SCRIPT, blocks)
+        cached = self.skip_unchanged(key, fingerprint, "block lookup, name assertions and failure screenshots")
+        if cached is not None:
+            return {name: dict(cached[name], skipped=True) for name in block_names}
+
+        wait_key = self.wait_key("careers_blocks")
+        timeout = adaptive_timeouts.resolve_timeout(wait_key, timeout)
+        started = time.perf_counter()
+        waits.ensure_script_timeout(self.driver, timeout + 5)
+        try:
+            found = self.driver.execute_async_script(FIND_BLOCKS_SCRIPT, blocks, int(timeout * 1000))
+        except TimeoutException:
+            verification_cache.get_cache().invalidate(key)
+            raise
+        if all(block["actual_name"] for block in found.values()):
+            adaptive_timeouts.record(wait_key, time.perf_counter() - started)
+
+        results = {}
+        for name in block_names:
+            expected_name = self.EXPECTED_BLOCKS[name]["expected_name"]
+            actual_name = found[name]["actual_name"]
+            results[name] = {
+                "found": found[name]["found"],
+                "name_mismatch": actual_name != expected_name,
+                "actual_name": actual_name,
+                "expected_name": expected_name
+            }
+
+        attach("\n".join(f"{name}: found={result['found']}, expected='{result['expected_name']}', "
+                          f"actual='{result['actual_name']}'" for name, result in results.items()),
+               name="Careers Blocks", attachment_type=allure.attachment_type.TEXT)
+        if all(result["found"] and not result["name_mismatch"] for result in results.values()):
+            fingerprint = self.driver.execute_script(BLOCKS_FINGERPRINT_SCRIPT, blocks)
+            verification_cache.get_cache().store(key, fingerprint, results)
+        else:
+            verification_cache.get_cache().invalidate(key)
+        return results
+
     @allure.step("Verify presence and expected name of block: {block_name}")
-    def verify_block_presence(self, block_name):
+    def verify_block_presence(self, block_name, result=None):
         """
         Verify the presence of a specific block and its expected name.
+
+        :param block_name: Name of the block in EXPECTED_BLOCKS.
+        :param result: Result of an earlier verify_blocks call; the block is looked up if omitted.
         """
         block_data = self.EXPECTED_BLOCKS.get(block_name)
         if not block_data:
             raise ValueError(f"No configuration found for block: {block_name}")
 
-        result = self._verify_block(block_data["locator"], block_data["expected_name"], block_data["header_tag"])
+        if result is None:
+            result = self.verify_blocks([block_name])[block_name]
+        if result.get("skipped"):
+            return  # Passed in the last run and unchanged since (see verify_blocks)
+
+        if not result["found"]:
+            self.take_screenshot(f"{block_name}_not_found")
+            raise AssertionError(f"Block '{block_name}' was not found on the page")
 
         if result["name_mismatch"]:
             self.take_centered_screenshot(f"{block_name}_name_mismatch", block_data["locator"])
-            allure.attach(
+            attach(
                 f"Expected: '{result['expected_name']}', Found: '{result['actual_name']}'",
                 name=f"{block_name.capitalize()} Verification Result", attachment_type=allure.attachment_type.TEXT)
             raise AssertionError(
                 f"Name mismatch for block '{block_name}': Expected '{result['expected_name']}', but found '{result['actual_name']}'")
 
-    def _verify_block(self, locator, expected_name, header_tag):
-        """Locate block, scroll if necessary, and verify title."""
-        try:
-            block = self.wait_for_element(locator, timeout=3)
-            actual_name = self._get_block_title(block, header_tag)
-            return {
-                "found": True,
-                "name_mismatch": actual_name != expected_name,
-                "actual_name": actual_name,
-                "expected_name": expected_name
-            }
-        except (TimeoutException, NoSuchElementException):
-            return self._scroll_and_verify_block(locator, expected_name, header_tag)
+    def verify_block_visuals(self, block_results):
+        """
+        Compare every block found by verify_blocks with its visual baseline (when visual regression is enabled).
+        Blocks that were not found are not captured. Blocks skipped as unchanged in incremental mode are
+        still compared: the fingerprint only covers their header text, not their layout.
 
-    @staticmethod
-    def _get_block_title(block, header_tag):
-        """Retrieve the block title using the specified header tag."""
-        try:
-            return block.find_element(By.TAG_NAME, header_tag).text.strip()
-        except NoSuchElementException:
-            raise NoSuchElementException(f"No title element found in block using tag '{header_tag}'")
-
-    def _scroll_and_verify_block(self, locator, expected_name, header_tag):
-        """Scroll down until the block is located, and verify the title if found."""
-        max_scroll_attempts = 6
-        scroll_height = 1000
-        block = None
-
-        for _ in range(max_scroll_attempts):
-            try:
-                block = self.wait_for_element(locator, timeout=5)
-                self.take_centered_screenshot("scrolling_to_block", locator)
-                break
-            except TimeoutException:
-                self.driver.execute_script(f"window.scrollBy(0, {scroll_height});")
-
-        actual_name = self._get_block_title(block, header_tag) if block else ""
-        return {
-            "found": bool(block),
-            "name_mismatch": actual_name != expected_name,
-            "actual_name": actual_name,
-            "expected_name": expected_name
-        }
+        :param block_results: Result of verify_blocks.
+        :raises AssertionError: With every block that differs from its baseline.
+        """
+        if visual_regression.get_store() is None:
+            return
+        failures = []
+        with allure.step("Compare careers blocks with their visual baselines"):
+            for name, result in block_results.items():
+                if not result["found"]:
+                    continue
+                block = self.EXPECTED_BLOCKS[name]
+                try:
+                    self.compare_with_baseline(f"careers_{name}", block["locator"], block.get("visual_masks", ()))
+                except (AssertionError, TimeoutException) as e:
+                    failures.append(str(e))
+            assert not failures, "; ".join(failures)
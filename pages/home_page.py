@@ -1,7 +1,7 @@
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
-import time
+from utils.attachments import attach
 import allure
 
 
@@ -17,7 +17,7 @@ class HomePage(BasePage):
 
     def open(self):
         """Open the Insider home page and accept cookies if prompted."""
-        self.driver.get(self.URL)
+        self.open_url(self.URL)
         self.accept_cookies()  # Accept cookies after opening the page
 
     @allure.step("Accept cookies on the website if the banner is present")
@@ -29,10 +29,10 @@ class HomePage(BasePage):
             if cookie_banner:
                 accept_button = self.wait_for_element(self.ACCEPT_COOKIES_BUTTON_LOCATOR)
                 accept_button.click()
-                allure.attach("Accepted cookies.", name="Cookie Acceptance")
-                time.sleep(1)  # Brief wait to ensure the banner is dismissed
+                attach("Accepted cookies.", name="Cookie Acceptance")
+                self.pause(1)  # Brief wait to ensure the banner is dismissed
         except TimeoutException:
-            allure.attach("No cookie banner found; proceeding without interaction.", name="Cookie Banner Status")
+            attach("No cookie banner found; proceeding without interaction.", name="Cookie Banner Status")
 
     def go_to_careers(self):
         """Navigate to the Careers page through the Company menu."""
@@ -1,18 +1,127 @@
+import csv
+import io
 import time
 import allure
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.support.wait import WebDriverWait
 
 from pages.base_page import BasePage
+from utils import page_performance, verification_cache, waits
+from utils.attachments import attach
+from utils.browser_profiles import block_resources_in_window
+from utils.site import resolve_url
+
+# Async script used by OpenPositionsPage.iter_job_batches. Arguments: job card selectors, batch size,
+# load-more selector, load timeout (ms), quiet period (ms).
+# Reads up to a batch of job cards that were not streamed yet and marks them as streamed. When none are
+# left, it asks the listing for more (clicking the load-more or next-page control if there is one,
+# scrolling past the last card otherwise) and reads the new cards once the list has been quiet for the
+# quiet period. Resolves with {jobs, exhausted}; exhausted is set when no new cards arrive in time.
+READ_JOB_BATCH_SCRIPT = """
+const [selectors, batchSize, loadMoreSelector, timeoutMs, quietMs, done] = arguments;
+const list = document.querySelector(selectors.list);
+if (!list) return done({jobs: [], exhausted: true});
+
+const text = (item, selector) => {
+    const element = item.querySelector(selector);
+    return element ? element.innerText.trim() : null;
+};
+
+function take() {
+    const items = Array.from(list.querySelectorAll(selectors.item + ':not([data-streamed])')).slice(0, batchSize);
+    return items.map(item => {
+        item.setAttribute('data-streamed', '');
+        return {
+            position: text(item, selectors.position),
+            department: text(item, selectors.department),
+            location: text(item, selectors.location)
+        };
+    });
+}
+
+const jobs = take();
+if (jobs.length) return done({jobs, exhausted: false});
+
+let quietTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+observer.observe(list, {childList: true, subtree: true});
+const deadline = setTimeout(finish, timeoutMs);
+
+function finish() {
+    observer.disconnect();
+    clearTimeout(deadline);
+    clearTimeout(quietTimer);
+    const jobs = take();
+    done({jobs, exhausted: !jobs.length});
+}
+
+const loadMore = loadMoreSelector && document.querySelector(loadMoreSelector);
+if (loadMore && !loadMore.disabled && loadMore.offsetParent !== null) {
+    loadMore.click();
+} else {
+    const items = list.querySelectorAll(selectors.item);
+    (items[items.length - 1] || list).scrollIntoView({block: 'end'});
+    window.scrollBy(0, window.innerHeight);
+}
+"""
+
+# Script used by OpenPositionsPage.verify_jobs. Arguments: job card selectors (as for READ_JOB_BATCH_SCRIPT).
+# Returns the fingerprint of the title, department and location of every job card.
+JOBS_FINGERPRINT_SCRIPT = verification_cache.FINGERPRINT_FUNCTION + """
+const selectors = arguments[0];
+const list = document.querySelector(selectors.list);
+if (!list) return null;
+const text = (item, selector) => {
+    const element = item.querySelector(selector);
+    return element ? element.innerText.trim() : '<missing>';
+};
+return fingerprint(Array.from(list.querySelectorAll(selectors.item)).map(item =>
+    [selectors.position, selectors.department, selectors.location].map(s => text(item, s)).join('|')
+).join('\\n'));
+"""
+
+# Script used by OpenPositionsPage.open_first_job. Arguments: position title selector, 'View Role' selector.
+# Returns the fingerprint of the first job title and the target of its 'View Role' link, or null.
+FIRST_JOB_FINGERPRINT_SCRIPT = verification_cache.FINGERPRINT_FUNCTION + """
+const [positionSelector, viewRoleSelector] = arguments;
+const title = document.querySelector(positionSelector);
+const link = document.querySelector(viewRoleSelector);
+return title && link ? fingerprint(title.innerText.trim() + '|' + link.href) : null;
+"""
 
 
 class OpenPositionsPage(BasePage):
+    URL = "https://useinsider.com/careers/open-positions/"
+    ENTRY_URL = URL + "?department=qualityassurance"  # Deep link with the QA department preselected
+
+    # Performance budgets of the listing page and of the Lever posting opened by 'View Role'
+    PERFORMANCE_BUDGET = {
+        "ttfb_ms": 1500,
+        "dom_content_loaded_ms": 4000,
+        "load_ms": 8000,
+        "transfer_bytes": 6_000_000,
+        "request_count": 200,
+    }
+    LEVER_PERFORMANCE_BUDGET = {
+        "ttfb_ms": 1000,
+        "dom_content_loaded_ms": 2500,
+        "load_ms": 4000,
+        "transfer_bytes": 2_000_000,
+        "request_count": 60,
+    }
+
     # Locators for filter dropdowns
     LOCATION_FILTER_LOCATOR = (By.CSS_SELECTOR, "#select2-filter-by-location-container")
     DEPARTMENT_FILTER_LOCATOR = (By.CSS_SELECTOR, "#select2-filter-by-department-container")
 
+    # Locators for the native <select> elements backing the select2 dropdowns
+    LOCATION_SELECT_LOCATOR = (By.CSS_SELECTOR, "#filter-by-location")
+    DEPARTMENT_SELECT_LOCATOR = (By.CSS_SELECTOR, "#filter-by-department")
+
     # Locators for job listing elements
     JOB_LIST_LOCATOR = (By.CSS_SELECTOR, "#jobs-list")  # Main container for the job listings
     JOB_ITEM_LOCATOR = (By.CSS_SELECTOR, ".position-list-item")  # Locator for each job item
@@ -21,67 +130,351 @@ class OpenPositionsPage(BasePage):
     LOCATION_LOCATOR = (By.CSS_SELECTOR, ".position-location")  # Location within each job item
     VIEW_ROLE_BUTTON_LOCATOR = (By.CSS_SELECTOR, "a.btn:nth-child(4)")  # Alternative locator for "View Role" button
 
-    @allure.step("Apply filters for Istanbul, Turkey and Quality Assurance")
-    def apply_filters(self):
+    # Control that loads the next page of a paginated listing (infinite-scroll listings have none)
+    LOAD_MORE_LOCATOR = (By.CSS_SELECTOR, ".load-more, .pagination .next a, a[rel='next']")
+    # Markers of the common infinite-scroll implementations, which load the next page when the end of the list
+    # scrolls into view: Elementor's load-on-scroll anchor (the site is built with Elementor), Jetpack's
+    # handle and the Infinite Scroll library's data attribute (also set on the local replica's sentinel)
+    INFINITE_SCROLL_LOCATOR = (By.CSS_SELECTOR,
+                               ".e-load-more-anchor[data-next-page], #infinite-handle, [data-infinite-scroll]")
+
+    @allure.step("Apply filters for {location} and {department}")
+    def apply_filters(self, location="Istanbul, Turkey", department="Quality Assurance"):
         """
-        Apply location and department filters on the job listing page.
+        Apply location and department filters on the job listing page in one round trip,
+        returning as soon as the job list has finished re-rendering.
+
+        :return: Result of apply_select_filters.
         """
         try:
-            # Select 'Istanbul, Turkey' in the location filter
-            self.select_dropdown_option(
-                self.LOCATION_FILTER_LOCATOR,
-                "Istanbul, Turkey"
-            )
-
-            # Select 'Quality Assurance' in the department filter
-            self.select_dropdown_option(
-                self.DEPARTMENT_FILTER_LOCATOR,
-                "Quality Assurance"
+            result = self.apply_select_filters(
+                {
+                    self.LOCATION_SELECT_LOCATOR[1]: location,
+                    self.DEPARTMENT_SELECT_LOCATOR[1]: department,
+                },
+                self.JOB_LIST_LOCATOR
             )
 
-            # Short delay to ensure filters are applied
-            time.sleep(2)
-
             # Attach confirmation message for applied filters
-            allure.attach("Filters applied: Istanbul, Turkey; Quality Assurance", name="Filter Details")
+            attach(f"Filters applied: {location}; {department}", name="Filter Details")
+            return result
         except Exception as e:
             # Capture error details and screenshot in case of failure
             self.take_screenshot("apply_filters_failure")
-            allure.attach(str(e), name="Filter Application Error", attachment_type=allure.attachment_type.TEXT)
+            attach(str(e), name="Filter Application Error", attachment_type=allure.attachment_type.TEXT)
+            raise
+
+    def start_filters(self, location="Istanbul, Turkey", department="Quality Assurance"):
+        """
+        Start applying the location and department filters without waiting for the job list to re-render,
+        so that other tabs can be driven while the listing's AJAX request is pending. Poll filters_applied().
+        """
+        self._pending_filters = (location, department)
+        self.start_select_filters(
+            {
+                self.LOCATION_SELECT_LOCATOR[1]: location,
+                self.DEPARTMENT_SELECT_LOCATOR[1]: department,
+            },
+            self.JOB_LIST_LOCATOR
+        )
+
+    def filters_applied(self):
+        """
+        :return: True once the job list has finished re-rendering after start_filters.
+        """
+        try:
+            if self.select_filters_result() is None:
+                return False
+        except Exception as e:
+            self.take_screenshot("apply_filters_failure")
+            attach(str(e), name="Filter Application Error", attachment_type=allure.attachment_type.TEXT)
             raise
+        attach("Filters applied: {}; {}".format(*self._pending_filters), name="Filter Details")
+        return True
+
+    def count_jobs(self):
+        """
+        :return: Number of job cards currently in the listing.
+        """
+        return self.driver.execute_script(
+            "const list = document.querySelector(arguments[0]);"
+            "return list ? list.querySelectorAll(arguments[1]).length : 0;",
+            self.JOB_LIST_LOCATOR[1], self.JOB_ITEM_LOCATOR[1]
+        )
+
+    def get_job_records(self):
+        """
+        Extract the title, department and location of every job card in a single script call.
+
+        :return: List of dictionaries with 'position', 'department' and 'location' keys.
+        """
+        return self.driver.execute_script(
+            """
+            const [listSelector, itemSelector, positionSelector, departmentSelector, locationSelector] = arguments;
+            const list = document.querySelector(listSelector);
+            if (!list) return [];
+            const text = (item, selector) => {
+                const element = item.querySelector(selector);
+                return element ? element.innerText.trim() : null;
+            };
+            return Array.from(list.querySelectorAll(itemSelector)).map(item => ({
+                position: text(item, positionSelector),
+                department: text(item, departmentSelector),
+                location: text(item, locationSelector)
+            }));
+            """,
+            self.JOB_LIST_LOCATOR[1], self.JOB_ITEM_LOCATOR[1], self.POSITION_NAME_LOCATOR[1],
+            self.DEPARTMENT_LOCATOR[1], self.LOCATION_LOCATOR[1]
+        )
+
+    def iter_job_batches(self, batch_size=50, load_timeout=2, quiet_period=0.3):
+        """
+        Stream the job records of the listing in batches as the cards load, by pagination or
+        infinite scroll. Only the current batch is held in memory; cards already streamed are marked
+        in the page and never read again. The marks of an earlier stream are cleared first, so the
+        same rendered listing can be streamed again.
+
+        :param batch_size: Maximum number of job records per batch.
+        :param load_timeout: Time (in seconds) allowed for more cards to arrive before the listing is considered exhausted.
+        :param quiet_period: Time (in seconds) without list changes after which newly loaded cards are read.
+        :return: Generator of lists of job records with 'position', 'department' and 'location' keys.
+        """
+        selectors = self._job_card_selectors()
+        waits.ensure_script_timeout(self.driver, load_timeout + 5)
+        self.driver.execute_script(
+            "document.querySelectorAll(arguments[0]).forEach(item => item.removeAttribute('data-streamed'));",
+            f"{selectors['list']} {selectors['item']}[data-streamed]"
+        )
+        while True:
+            result = self.driver.execute_async_script(
+                READ_JOB_BATCH_SCRIPT, selectors, batch_size, self.LOAD_MORE_LOCATOR[1],
+                int(load_timeout * 1000), int(quiet_period * 1000)
+            )
+            if not result["jobs"]:
+                return
+            yield result["jobs"]
+
+    def _job_card_selectors(self):
+        """CSS selectors of the job list, the job cards and their fields, as passed to the listing scripts."""
+        return {
+            "list": self.JOB_LIST_LOCATOR[1], "item": self.JOB_ITEM_LOCATOR[1],
+            "position": self.POSITION_NAME_LOCATOR[1], "department": self.DEPARTMENT_LOCATOR[1],
+            "location": self.LOCATION_LOCATOR[1],
+        }
+
+    @staticmethod
+    def find_job_mismatches(jobs, location, department, position_keyword, start=1):
+        """
+        Check job records against the expected filter values.
+
+        :param start: Number of the first job in the messages (for batches of a longer listing).
+        :return: List of human-readable mismatch descriptions (empty when every job matches).
+        """
+        mismatches = []
+        for index, job in enumerate(jobs, start=start):
+            for field, expected in (("position", position_keyword), ("department", department),
+                                    ("location", location)):
+                if job[field] is None:
+                    mismatches.append(f"Job #{index}: {field} element not found")
+                elif expected not in job[field]:
+                    mismatches.append(f"Job #{index}: unexpected {field}: {job[field]}")
+        return mismatches
+
+    @staticmethod
+    def _jobs_to_csv(jobs):
+        """Render job records as CSV text for a single tabular report attachment."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["position", "department", "location"])
+        writer.writeheader()
+        writer.writerows(jobs)
+        return buffer.getvalue()
 
     @allure.step("Check that job listings are displayed and match filter criteria")
-    def verify_jobs(self):
-        """Verify that job listings match the selected filters."""
+    def verify_jobs(self, location="Istanbul, Turkey", department="Quality Assurance", position_keyword=None):
+        """
+        Verify that job listings match the selected filters.
+
+        All job cards are read in one round trip and checked in Python, so the number of
+        WebDriver calls does not grow with the number of listings. In incremental mode, the checks
+        are skipped when the fingerprint of the job cards is unchanged since the last passing run
+        with the same filters, and the job records of that run are returned.
+
+        :param location: Expected location of every job.
+        :param department: Expected department of every job.
+        :param position_keyword: Text expected in every position title (defaults to the department).
+        :return: List of verified job records.
+        """
+        position_keyword = position_keyword or department
+        key = self.verification_key(f"jobs:{location}|{department}|{position_keyword}")
         try:
             self.driver.execute_script("window.scrollTo(0, 500);")  # Scroll down to reveal job listings
-            job_list_container = self.wait_for_element(self.JOB_LIST_LOCATOR)
-            jobs = job_list_container.find_elements(*self.JOB_ITEM_LOCATOR)
-            assert jobs, "No jobs were found after applying filters"
-            allure.attach(f"Found {len(jobs)} job listings after applying filters.", name="Job Listing Count")
+            self.wait_for_element(self.JOB_LIST_LOCATOR)
+            fingerprint = self.driver.execute_script(JOBS_FINGERPRINT_SCRIPT, self._job_card_selectors())
+            cached = self.skip_unchanged(key, fingerprint, "job card field assertions and listing attachment")
+            if cached is not None:
+                return cached["jobs"]
 
-            for job in jobs:
-                position_name = job.find_element(*self.POSITION_NAME_LOCATOR).text
-                department_name = job.find_element(*self.DEPARTMENT_LOCATOR).text
-                location_name = job.find_element(*self.LOCATION_LOCATOR).text
-
-                allure.attach(f"Position: {position_name}", name="Position Verification")
-                allure.attach(f"Department: {department_name}", name="Department Verification")
-                allure.attach(f"Location: {location_name}", name="Location Verification")
+            jobs = self.get_job_records()
+            assert jobs, "No jobs were found after applying filters"
+            attach(self._jobs_to_csv(jobs), name=f"Job Listings ({len(jobs)})",
+                   attachment_type=allure.attachment_type.CSV)
 
-                assert "Quality Assurance" in position_name, f"Unexpected position name: {position_name}"
-                assert "Quality Assurance" in department_name, f"Unexpected department: {department_name}"
-                assert "Istanbul, Turkey" in location_name, f"Unexpected location: {location_name}"
+            mismatches = self.find_job_mismatches(jobs, location, department, position_keyword)
+            assert not mismatches, "Job listings do not match filters: " + "; ".join(mismatches)
+            verification_cache.get_cache().store(key, fingerprint, {"jobs": jobs})
+            return jobs
         except (TimeoutException, NoSuchElementException, AssertionError) as e:
+            # Every failure, including an empty listing, makes the next run verify in full
+            verification_cache.get_cache().invalidate(key)
             # Attach the exception message to Allure and re-raise the exception
-            allure.attach(f"Error encountered during job listing verification: {str(e)}",
-                          name="Job Verification Error", attachment_type=allure.attachment_type.TEXT)
+            attach(f"Error encountered during job listing verification: {str(e)}",
+                   name="Job Verification Error", attachment_type=allure.attachment_type.TEXT)
+            raise
+
+    def is_paginated(self):
+        """
+        :return: True if the listing loads its job cards in pages (a load-more control or an infinite-scroll
+                 marker is present), so that reading the cards once would miss postings. An infinite scroll
+                 built without any of the markers in INFINITE_SCROLL_LOCATOR is not detected; the live
+                 listing currently renders every posting at once and has none of them.
+        """
+        return self.driver.execute_script(
+            "return !!document.querySelector(arguments[0] + ', ' + arguments[1]);",
+            self.LOAD_MORE_LOCATOR[1], self.INFINITE_SCROLL_LOCATOR[1]
+        )
+
+    def verify_listing(self, location="Istanbul, Turkey", department="Quality Assurance", position_keyword=None):
+        """
+        Verify the whole job listing: streamed in batches when the listing is paginated, read at once otherwise.
+
+        :return: Result of verify_jobs_streaming (a summary) or of verify_jobs (the verified job records).
+        """
+        if self.is_paginated():
+            attach("The listing is paginated: job cards are streamed in batches.", name="Listing Mode")
+            return self.verify_jobs_streaming(location, department, position_keyword)
+        return self.verify_jobs(location, department, position_keyword)
+
+    @allure.step("Stream job listings in batches and check that they match filter criteria")
+    def verify_jobs_streaming(self, location="Istanbul, Turkey", department="Quality Assurance",
+                              position_keyword=None, batch_size=50, stop_on_first_mismatch=False,
+                              max_reported_mismatches=20):
+        """
+        Verify job listings batch by batch as they load, for listings too long to read at once.
+
+        Memory stays bounded by the batch size: only mismatch counts, the first mismatches and
+        per-batch statistics are kept. Per-batch throughput is attached as a CSV table.
+
+        :param location: Expected location of every job.
+        :param department: Expected department of every job.
+        :param position_keyword: Text expected in every position title (defaults to the department).
+        :param batch_size: Maximum number of job records read per round trip.
+        :param stop_on_first_mismatch: Stop streaming after the first batch with a mismatch.
+        :param max_reported_mismatches: Number of mismatch descriptions kept for the report.
+        :return: Summary with 'jobs', 'batches', 'mismatches', 'stopped_early' and 'jobs_per_second' keys.
+        """
+        position_keyword = position_keyword or department
+        summary = {"jobs": 0, "batches": 0, "mismatches": 0, "stopped_early": False, "jobs_per_second": 0.0}
+        reported = []
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["batch", "jobs", "load_s", "verify_s", "jobs_per_s"])
+
+        started = batch_started = time.perf_counter()
+        try:
+            for batch in self.iter_job_batches(batch_size):
+                loaded = time.perf_counter()
+                mismatches = self.find_job_mismatches(batch, location, department, position_keyword,
+                                                      start=summary["jobs"] + 1)
+                verified = time.perf_counter()
+
+                summary["batches"] += 1
+                summary["jobs"] += len(batch)
+                summary["mismatches"] += len(mismatches)
+                reported.extend(mismatches[:max_reported_mismatches - len(reported)])
+                writer.writerow([summary["batches"], len(batch), f"{loaded - batch_started:.3f}",
+                                 f"{verified - loaded:.3f}", f"{len(batch) / max(verified - batch_started, 1e-6):.1f}"])
+                if mismatches and stop_on_first_mismatch:
+                    summary["stopped_early"] = True
+                    break
+                batch_started = time.perf_counter()
+        finally:
+            summary["jobs_per_second"] = round(summary["jobs"] / max(time.perf_counter() - started, 1e-6), 1)
+            attach(buffer.getvalue(), name=f"Job Listing Batches ({summary['jobs']} jobs)",
+                   attachment_type=allure.attachment_type.CSV)
+
+        try:
+            assert summary["jobs"], "No jobs were found after applying filters"
+            assert not summary["mismatches"], (
+                f"{summary['mismatches']} job listing mismatch(es) with filters"
+                + (" (stopped at the first failing batch)" if summary["stopped_early"] else "")
+                + ": " + "; ".join(reported)
+            )
+            return summary
+        except AssertionError as e:
+            attach(f"Error encountered during job listing verification: {str(e)}",
+                   name="Job Verification Error", attachment_type=allure.attachment_type.TEXT)
             raise
 
+    @allure.step("Verify job listings for every filter combination")
+    def run_filter_matrix(self, combinations):
+        """
+        Verify the job listing for many location/department combinations on the page already loaded.
+
+        The select2 filters are reapplied in place for every combination and each listing is checked
+        with verify_jobs, so no page, cookie or browser setup is repeated. Many combinations have no
+        postings: an empty listing is recorded with the status 'empty' instead of as a failure. A failing
+        combination is recorded and the matrix moves on to the next one.
+
+        :param combinations: Iterable of (location, department) or (location, department, position_keyword) tuples,
+                             e.g. itertools.product(locations, departments).
+        :return: Dictionary with 'results' (location, department, status - 'passed', 'empty' or 'failed' -,
+                 jobs, seconds and error of every combination) and 'combinations_per_minute'.
+        """
+        results = []
+        started = time.perf_counter()
+        for location, department, *position_keyword in combinations:
+            result = {"location": location, "department": department, "status": "passed", "jobs": 0,
+                      "seconds": 0.0, "error": None}
+            combination_started = time.perf_counter()
+            try:
+                with allure.step(f"Filter combination: {location} / {department}"):
+                    self.apply_filters(location, department)
+                    if self.count_jobs():
+                        result["jobs"] = len(self.verify_jobs(location, department, *position_keyword))
+                    else:
+                        result["status"] = "empty"
+            except (TimeoutException, NoSuchElementException, AssertionError) as e:
+                result["status"], result["error"] = "failed", str(e)
+            result["seconds"] = round(time.perf_counter() - combination_started, 3)
+            results.append(result)
+
+        elapsed = time.perf_counter() - started
+        combinations_per_minute = round(len(results) * 60 / elapsed, 1) if results else 0.0
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["location", "department", "status", "jobs", "seconds", "error"])
+        writer.writeheader()
+        writer.writerows(results)
+        counts = {status: sum(1 for result in results if result["status"] == status)
+                  for status in ("passed", "empty", "failed")}
+        attach(buffer.getvalue(), name="Filter Matrix ({passed} passed, {empty} empty, {failed} failed)".format(**counts),
+               attachment_type=allure.attachment_type.CSV)
+        attach(f"{len(results)} combinations in {elapsed:.1f} seconds ({combinations_per_minute} per minute)",
+               name="Filter Matrix Throughput")
+        return {"results": results, "combinations_per_minute": combinations_per_minute}
+
     @allure.step("Open the first job listing and verify redirection to Lever application form")
     def open_first_job(self):
-        """Open the first job listing by hovering over the title and clicking the 'View Role' button, then verify redirection."""
-        expected_url_substring = "https://jobs.lever.co/useinsider/"
+        """
+        Open the first job listing by hovering over the title and clicking the 'View Role' button, then verify redirection.
+        In incremental mode, this is skipped when the first job and its link are unchanged since the last passing run.
+        """
+        expected_url_substring = resolve_url("https://jobs.lever.co/useinsider/")
+        key = self.verification_key("first_job_lever")
+        fingerprint = self.driver.execute_script(FIRST_JOB_FINGERPRINT_SCRIPT, self.POSITION_NAME_LOCATOR[1],
+                                                 self.VIEW_ROLE_BUTTON_LOCATOR[1])
+        if self.skip_unchanged(key, fingerprint, "hover and click into the Lever posting") is not None:
+            return
+        initial_handles = set(self.driver.window_handles)  # Tabs open before clicking
 
         try:
             with allure.step("Hover over the job title to reveal 'View Role' button"):
@@ -91,44 +484,58 @@ class OpenPositionsPage(BasePage):
 
                 # After hovering, attempt to find and click the 'View Role' button
                 view_role_button = self.wait_for_element(self.VIEW_ROLE_BUTTON_LOCATOR, timeout=10)
-                initial_tab_count = len(self.driver.window_handles)  # Count tabs before clicking
                 view_role_button.click()
-                allure.attach("Clicked 'View Role' button.", name="Click Info",
-                              attachment_type=allure.attachment_type.TEXT)
+                attach("Clicked 'View Role' button.", name="Click Info",
+                       attachment_type=allure.attachment_type.TEXT)
 
                 # Wait for a new tab to open
-                WebDriverWait(self.driver, 10).until(
-                    lambda d: len(d.window_handles) > initial_tab_count,
+                self.wait_until(
+                    "lever_new_tab", lambda d: len(d.window_handles) > len(initial_handles), 10,
                     message="New tab did not open after clicking 'View Role' button."
                 )
 
-                # Switch to the new tab
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-                allure.attach("Switched to new tab successfully.", name="Tab Switch Info",
-                              attachment_type=allure.attachment_type.TEXT)
+                # Switch to the new tab (other tabs of the session may have been opened after this one)
+                new_handle = next(h for h in self.driver.window_handles if h not in initial_handles)
+                self.driver.switch_to.window(new_handle)
+                page_performance.enlarge_resource_buffer(self.driver)
+                if block_resources_in_window(self.driver):
+                    # The tab started loading before the profile's blocking could be set in it: reload it
+                    # so the posting loads the same resources as the other tabs
+                    self.driver.refresh()
+                attach("Switched to new tab successfully.", name="Tab Switch Info",
+                       attachment_type=allure.attachment_type.TEXT)
 
             # Step to wait for the page to load
             with allure.step("Wait for page to load in new tab"):
-                time.sleep(5)  # Simple wait to ensure page has loaded
-                allure.attach("Waited 5 seconds for the page to load.", name="Wait Info",
-                              attachment_type=allure.attachment_type.TEXT)
+                started = time.perf_counter()
+                self.wait_until(
+                    "lever_page_load",
+                    lambda d: d.current_url != "about:blank"
+                    and d.execute_script("return document.readyState") == "complete",
+                    10, message="Page in the new tab did not finish loading."
+                )
+                attach(f"Page loaded after {time.perf_counter() - started:.2f} seconds.", name="Wait Info",
+                       attachment_type=allure.attachment_type.TEXT)
+                self.collect_performance("LeverPostingPage", self.LEVER_PERFORMANCE_BUDGET)
 
             # Step to check the URL
             with allure.step("Verify URL in the new tab"):
                 current_url = self.driver.current_url
-                allure.attach(f"Expected URL to contain: {expected_url_substring}", name="Expected URL",
-                              attachment_type=allure.attachment_type.TEXT)
-                allure.attach(f"Actual URL: {current_url}", name="Actual URL",
-                              attachment_type=allure.attachment_type.TEXT)
+                attach(f"Expected URL to contain: {expected_url_substring}", name="Expected URL",
+                       attachment_type=allure.attachment_type.TEXT)
+                attach(f"Actual URL: {current_url}", name="Actual URL",
+                       attachment_type=allure.attachment_type.TEXT)
                 assert expected_url_substring in current_url, (
                     f"Expected URL to contain '{expected_url_substring}', but found: {current_url}"
                 )
+            verification_cache.get_cache().store(key, fingerprint, {"url": current_url})
 
         except (TimeoutException, NoSuchElementException, AssertionError) as e:
+            verification_cache.get_cache().invalidate(key)
             # Capture URL in case of failure and attach to Allure report
             current_url = self.driver.current_url if len(
-                self.driver.window_handles) > initial_tab_count else "Tab did not open"
+                self.driver.window_handles) > len(initial_handles) else "Tab did not open"
             error_message = f"Expected Lever URL to contain '{expected_url_substring}', but current URL is: {current_url}"
-            allure.attach(error_message, name="Lever Application Navigation Error",
-                          attachment_type=allure.attachment_type.TEXT)
+            attach(error_message, name="Lever Application Navigation Error",
+                   attachment_type=allure.attachment_type.TEXT)
             raise e
@@ -7,7 +7,7 @@ class QualityAssurancePage(BasePage):
     SEE_ALL_QA_JOBS_LOCATOR = (By.CSS_SELECTOR, ".btn-outline-secondary")
 
     def open(self):
-        self.driver.get(self.URL)
+        self.open_url(self.URL)
 
     def click_see_all_qa_jobs(self):
         """Click the 'See all QA jobs' button and wait for the page to load."""
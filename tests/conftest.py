@@ -0,0 +1,432 @@
+import functools
+import json
+import os
+
+import pytest
+
+from utils import (adaptive_timeouts, attachments, driver_bootstrap, page_performance, screenshots, timing,
+                   verification_cache, visual_regression)
+from utils.browser_profiles import (PROFILES, format_page_loads, get_profile, merge_page_loads, page_loads,
+                                    summarize_page_loads)
+from utils.driver_pool import DriverPool, create_driver, merge_pool_stats
+from utils.parallel import is_worker, merge_worker_dirs, worker_namespace
+from utils.site import LEVER_URL_ENV, SITE_URL_ENV
+
+driver_pool_key = pytest.StashKey[DriverPool]()
+worker_outputs_key = pytest.StashKey[list]()
+timing_regressions_key = pytest.StashKey[list]()
+performance_key = pytest.StashKey[dict]()
+attachment_errors_key = pytest.StashKey[list]()
+screenshot_stats_key = pytest.StashKey[dict]()
+local_site_key = pytest.StashKey[object]()
+skipped_verifications_key = pytest.StashKey[list]()
+prewarm_key = pytest.StashKey[list]()
+
+# Browsers the driver fixture is parametrized with
+DRIVER_BROWSERS = ["chrome", "firefox"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("site")
+    group.addoption("--base-url", default=None,
+                    help="Run against another deployment of the Insider site instead of https://useinsider.com.")
+    group.addoption("--lever-url", default=None,
+                    help="Run against another deployment of the Lever postings instead of https://jobs.lever.co.")
+    group.addoption("--local-site", action="store_true",
+                    help="Start the bundled local replica of the careers flow and run against it.")
+    group.addoption("--site-latency-ms", type=int, default=0,
+                    help="Response latency injected by the local replica (with --local-site).")
+    group.addoption("--site-jobs", type=int, default=30,
+                    help="Number of job postings served by the local replica (with --local-site).")
+    group.addoption("--site-page-size", type=int, default=None,
+                    help="Load the replica's job list in pages of this size on scroll (with --local-site).")
+
+    group = parser.getgroup("navigation")
+    group.addoption("--journey", action="store_true",
+                    help="Also run the journey tests that click through the site instead of entering pages directly.")
+
+    group = parser.getgroup("browser")
+    group.addoption("--browser-profile", default="default", choices=list(PROFILES),
+                    help="Browser profile: headless mode, page-load strategy and request blocking.")
+    group.addoption("--allow-domains", default="",
+                    help="Comma-separated extra hosts that the browser profile must never block.")
+    group.addoption("--prewarm", default="auto",
+                    help="Browsers to launch in the background while tests are collected: 'auto' (the browsers "
+                         "of the driver fixture; none under xdist), a comma-separated list (one session per "
+                         "xdist worker at most), or 'none'.")
+    group.addoption("--driver-path-cache", default=driver_bootstrap.DEFAULT_CACHE_FILE,
+                    help="JSON file caching the driver binary paths resolved by Selenium Manager on this machine.")
+
+    group = parser.getgroup("screenshots")
+    group.addoption("--screenshot-budget-mb", type=float, default=screenshots.DEFAULT_DISK_BUDGET_MB,
+                    help="Maximum disk space (MB) kept for the screenshots of one run; oldest are evicted first.")
+    group.addoption("--screenshot-max-width", type=int, default=None,
+                    help="Downscale stored screenshots to this width in pixels (requires Pillow).")
+
+    group = parser.getgroup("visual regression")
+    group.addoption("--visual-regression", action="store_true",
+                    help="Compare block captures with their visual baselines (requires numpy and Pillow).")
+    group.addoption("--visual-baselines", default=visual_regression.DEFAULT_BASELINE_DIR,
+                    help="Directory of the visual baselines; missing baselines are created from the captures.")
+    group.addoption("--visual-threshold", type=float, default=visual_regression.DEFAULT_THRESHOLD,
+                    help="Minimum similarity (share of unchanged pixels) of a capture with its baseline.")
+    group.addoption("--update-baselines", action="store_true",
+                    help="Replace the visual baselines with the captures of this run.")
+
+    group = parser.getgroup("timeouts")
+    group.addoption("--timeout-history", default=adaptive_timeouts.DEFAULT_HISTORY_FILE,
+                    help="JSON file with the latency history of named waits, used to derive their timeouts.")
+    group.addoption("--no-adaptive-timeouts", action="store_true",
+                    help="Use the default timeouts of the page objects instead of the learned ones.")
+    group.addoption("--test-budget", type=float, default=None,
+                    help="Overall time budget (seconds) per test; waits fail immediately once it is spent.")
+
+    group = parser.getgroup("verification")
+    group.addoption("--incremental", action="store_true",
+                    help="Skip verifications whose DOM fingerprint is unchanged since their last passing run.")
+    group.addoption("--full-verification", action="store_true",
+                    help="Verify everything in full even with --incremental (the cache is still refreshed).")
+    group.addoption("--verification-cache", default=verification_cache.DEFAULT_CACHE_FILE,
+                    help="JSON file with the fingerprints and results of the last passing verifications.")
+
+    group = parser.getgroup("performance")
+    group.addoption("--performance-history", default=page_performance.DEFAULT_HISTORY_FILE,
+                    help="JSON file that keeps the median page performance metrics of every run.")
+    group.addoption("--performance-json", default=None,
+                    help="Write the page performance samples and budget violations of this run to this JSON file.")
+    group.addoption("--no-page-performance", action="store_true",
+                    help="Do not collect page performance metrics after page loads.")
+
+    group = parser.getgroup("timing")
+    group.addoption("--timings-json", default=None,
+                    help="Write per-step timings and WebDriver command counts to this JSON file.")
+    group.addoption("--timings-baseline", default=None,
+                    help="Compare per-step timings against this JSON report and flag regressions.")
+    group.addoption("--timings-threshold", type=float, default=0.2,
+                    help="Relative increase (0.2 = 20%%) of step latency or command count flagged as a regression.")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Give every xdist worker its own allure-results namespace before the allure plugin opens it,
+    set up the background screenshot pipeline and point the page objects at the selected site.
+    """
+    config.stash[worker_outputs_key] = []
+    timing.install()
+    adaptive_timeouts.install(config.option.timeout_history, enabled=not config.option.no_adaptive_timeouts)
+    page_performance.recorder.enabled = not config.option.no_page_performance
+    verification_cache.install(config.option.verification_cache,
+                               incremental=config.option.incremental and not config.option.full_verification)
+    if config.option.local_site:
+        # Imported lazily so runs against the live site do not depend on the replica package
+        from local_site.server import LocalSite
+        site = LocalSite(latency_ms=config.option.site_latency_ms, jobs=config.option.site_jobs,
+                         page_size=config.option.site_page_size).start()
+        site.apply_environment()
+        config.stash[local_site_key] = site
+        config.add_cleanup(site.stop)
+    if config.option.base_url:
+        os.environ[SITE_URL_ENV] = config.option.base_url
+    if config.option.lever_url:
+        os.environ[LEVER_URL_ENV] = config.option.lever_url
+    screenshots.configure(config.option.screenshot_budget_mb, config.option.screenshot_max_width)
+    visual_regression.configure(config.option.visual_regression or config.option.update_baselines,
+                                config.option.visual_baselines, config.option.visual_threshold,
+                                config.option.update_baselines)
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if report_dir and is_worker():
+        config.option.allure_report_dir = worker_namespace(report_dir)
+    driver_bootstrap.configure(config.option.driver_path_cache)
+    config.stash[prewarm_key] = prewarm_browsers(config)
+
+
+def prewarm_browsers(config):
+    """
+    Browsers this process may pre-warm a session for. Runs that only list tests or fixtures
+    (--collect-only, --fixtures, --fixtures-per-test) and the xdist controller, which runs no tests,
+    pre-warm none. On xdist workers pre-warming is opt-in: only an explicit --prewarm list enables it.
+    """
+    option = config.option
+    runs_tests = is_worker() or not getattr(option, "numprocesses", None)
+    lists_only = option.collectonly or option.showfixtures or option.show_fixtures_per_test
+    if option.prewarm == "none" or not runs_tests or lists_only or (is_worker() and option.prewarm == "auto"):
+        return []
+    return DRIVER_BROWSERS if option.prewarm == "auto" else [browser.strip() for browser in option.prewarm.split(",")]
+
+
+def selection_skip(config, item):
+    """
+    Return the skip marker for a journey test not selected with --journey or -m journey, or a streaming
+    test without the paginated local replica; None if the item is not skipped by selection.
+    """
+    if item.get_closest_marker("journey") and not (config.option.journey
+                                                    or "journey" in (config.option.markexpr or "")):
+        return pytest.mark.skip(reason="journey test: select it with --journey or -m journey")
+    if item.get_closest_marker("streaming") and not (config.option.local_site and config.option.site_page_size):
+        return pytest.mark.skip(reason="streaming test: needs --local-site --site-page-size N")
+    return None
+
+
+def item_browser(item):
+    """Return the browser a test runs with, or None if it does not use the driver fixture or is skipped."""
+    callspec = getattr(item, "callspec", None)
+    if callspec is None or "driver" not in callspec.params or item.get_closest_marker("skip"):
+        return None
+    if selection_skip(item.config, item) is not None:
+        return None
+    return callspec.params["driver"]
+
+
+def pytest_itemcollected(item):
+    """
+    Launch a browser in the background as soon as collection finds a test that runs with it, so the
+    launch overlaps with the rest of collection and tests without a browser launch none. An xdist
+    worker pre-warms one session at most.
+    """
+    browsers = item.config.stash.get(prewarm_key, [])
+    browser = item_browser(item)
+    if browser in browsers:
+        browsers.remove(browser)
+        get_driver_pool(item.config).prewarm(browser)
+        if is_worker():
+            browsers.clear()
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip the full click-through journey tests unless they are selected with --journey or -m journey,
+    and the streaming tests unless the paginated local replica is running.
+    """
+    for item in items:
+        marker = selection_skip(config, item)
+        if marker is not None:
+            item.add_marker(marker)
+
+
+def pytest_collection_finish(session):
+    """Quit the pre-warmed sessions of browsers that no selected (and not skipped) test uses."""
+    pool = session.config.stash.get(driver_pool_key, None)
+    if pool is not None:
+        pool.cancel_prewarm(keep={item_browser(item) for item in session.items} - {None})
+
+
+def pytest_sessionstart(session):
+    """Move allure attachment writes to a background thread once the allure plugin is configured."""
+    attachments.install()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Record step timings of the test body within its time budget, and attach text entries buffered
+    outside of steps once the test body finishes, even if it failed.
+    """
+    instrumentation = timing.install()
+    instrumentation.begin_test(item.nodeid)
+    adaptive_timeouts.start_test_budget(item.config.option.test_budget)
+    yield
+    adaptive_timeouts.end_test_budget()
+    attachments.flush_test()
+    instrumentation.end_test()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    """
+    Attach text entries buffered by fixture finalizers and wait for the test's attachment files,
+    so the result files written so far never point to attachments a crashing worker did not write.
+    """
+    yield
+    attachments.flush_test()
+    attachments.flush()
+
+
+def pytest_sessionfinish(session):
+    """
+    Store pending screenshots and attachments, ship pool statistics, step timings, wait latencies,
+    page performance samples, verification cache updates, screenshot counters and attachment write
+    errors from workers to the controller, and merge worker allure results, timings, the latency
+    history, the verification cache and the page performance trend on the controller.
+    """
+    config = session.config
+    screenshot_stats = screenshots.shutdown()
+    attachment_errors = attachments.uninstall()
+    tests = timing.install().tests
+    if is_worker():
+        pool = config.stash.get(driver_pool_key, None)
+        if pool is not None:
+            config.workeroutput["driver_pool_stats"] = pool.stats()
+        config.workeroutput["timings"] = tests
+        config.workeroutput["page_loads"] = page_loads.to_dict()
+        config.workeroutput["latency_samples"] = dict(adaptive_timeouts.get_history().new_samples)
+        config.workeroutput["performance"] = page_performance.recorder.to_dict()
+        config.workeroutput["verification_updates"] = verification_cache.get_cache().updates
+        config.workeroutput["verification_skipped"] = verification_cache.get_cache().skipped
+        config.workeroutput["attachment_errors"] = attachment_errors
+        config.workeroutput["screenshot_stats"] = screenshot_stats
+        return
+
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if report_dir:
+        merge_worker_dirs(report_dir)
+
+    config.stash[attachment_errors_key] = attachment_errors + [
+        error for output in config.stash[worker_outputs_key] for error in output.get("attachment_errors", [])
+    ]
+    screenshot_stats = [screenshot_stats] + [output.get("screenshot_stats")
+                                             for output in config.stash[worker_outputs_key]]
+    screenshot_stats = [stats for stats in screenshot_stats if stats]
+    if screenshot_stats:
+        config.stash[screenshot_stats_key] = screenshots.merge_stats(screenshot_stats)
+    tests = dict(tests)
+    for output in config.stash[worker_outputs_key]:
+        tests.update(output.get("timings", {}))
+    adaptive_timeouts.get_history().save(output.get("latency_samples", {})
+                                         for output in config.stash[worker_outputs_key])
+    cache = verification_cache.get_cache()
+    cache.save(output.get("verification_updates", {}) for output in config.stash[worker_outputs_key])
+    config.stash[skipped_verifications_key] = cache.skipped + [
+        skip for output in config.stash[worker_outputs_key] for skip in output.get("verification_skipped", [])
+    ]
+
+    performance = page_performance.merge_results([page_performance.recorder.to_dict()] + [
+        output.get("performance", {}) for output in config.stash[worker_outputs_key]
+    ])
+    history = page_performance.load_history(config.option.performance_history)
+    performance["previous_run"] = history[-1] if history else None
+    performance["run"] = page_performance.save_run(performance, config.option.performance_history)
+    config.stash[performance_key] = performance
+    if config.option.performance_json:
+        with open(config.option.performance_json, "w", encoding="utf-8") as file:
+            json.dump({"samples": performance["samples"], "violations": performance["violations"]}, file, indent=2)
+
+    if config.option.timings_json:
+        timing.save_report(tests, config.option.timings_json)
+    if config.option.timings_baseline:
+        config.stash[timing_regressions_key] = timing.compare(
+            timing.to_report(tests), timing.load_report(config.option.timings_baseline),
+            config.option.timings_threshold
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the driver pool statistics and step timings reported by a finished xdist worker."""
+    output = getattr(node, "workeroutput", None)
+    if output:
+        node.config.stash[worker_outputs_key].append(output)
+
+
+def get_driver_pool(config):
+    """Return the pool of browser sessions of this pytest process (or xdist worker), creating it on first use."""
+    pool = config.stash.get(driver_pool_key, None)
+    if pool is None:
+        option = config.option
+        profile = get_profile(option.browser_profile)
+        if option.allow_domains:
+            profile = profile.with_allowed_domains(domain.strip() for domain in option.allow_domains.split(","))
+        pool = DriverPool(functools.partial(create_driver, profile=profile))
+        config.stash[driver_pool_key] = pool
+        config.add_cleanup(pool.close)
+    return pool
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Session-scoped pool of browser sessions shared by all tests of this pytest process (or xdist worker)."""
+    return get_driver_pool(request.config)
+
+
+@pytest.fixture(scope="session")
+def local_site(request):
+    """The local replica started with --local-site, or None when running against another site."""
+    return request.config.stash.get(local_site_key, None)
+
+
+@pytest.fixture(params=DRIVER_BROWSERS)
+def driver(request, driver_pool):
+    """Provide a pooled browser session (Chrome or Firefox) with a clean state."""
+    driver = timing.instrument_driver(driver_pool.acquire(request.param))
+    yield driver
+    page_loads.finish_all(driver)  # Loads still running when the test ended (eager and none strategies)
+    driver_pool.release(driver)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Report driver pool statistics, page load times per browser profile, skipped incremental
+    verifications, page performance against budgets and the previous run, screenshot pipeline counters,
+    allure attachments and screenshots that could not be written, and step timing regressions.
+    """
+    stats_list = [output["driver_pool_stats"] for output in config.stash.get(worker_outputs_key, [])
+                  if "driver_pool_stats" in output]
+    pool = config.stash.get(driver_pool_key, None)
+    if pool is not None:
+        stats_list.append(pool.stats())
+    stats = merge_pool_stats(stats_list) if stats_list else None
+    if stats and (stats["launches"] or stats["hits"] or stats["misses"]):
+        terminalreporter.write_sep("-", "driver pool")
+        terminalreporter.write_line(
+            f"hits: {stats['hits']}, misses: {stats['misses']}, prewarmed: {stats['prewarmed']}, "
+            f"replaced: {stats['replaced']}, launches: {stats['launches']}, "
+            f"total launch time: {stats['total_launch_time']}s, mean launch time: {stats['mean_launch_time']}s"
+        )
+        if stats["launches"]:
+            terminalreporter.write_line("mean time to first command: " + ", ".join(
+                f"{phase} {seconds / stats['launches']:.3f}s" for phase, seconds in stats["bootstrap"].items()
+            ))
+
+    loads = merge_page_loads([page_loads.to_dict()] + [output.get("page_loads", {})
+                                                       for output in config.stash.get(worker_outputs_key, [])])
+    for profile, pages in loads.items():
+        terminalreporter.write_sep("-", f"page load times (profile: {profile})")
+        for url, samples in sorted(pages.items()):
+            terminalreporter.write_line(f"{url}: {format_page_loads(summarize_page_loads(samples))}")
+
+    skipped = config.stash.get(skipped_verifications_key, [])
+    if skipped:
+        terminalreporter.write_sep("-", f"incremental verification: {len(skipped)} unchanged check(s) skipped")
+        for skip in skipped:
+            terminalreporter.write_line(f"{skip['key']}: skipped {skip['skipped']}")
+
+    performance = config.stash.get(performance_key, None)
+    if performance and performance["run"]:
+        previous = (performance["previous_run"] or {}).get("pages", {})
+        terminalreporter.write_sep("-", f"page performance (budget violations: {len(performance['violations'])})")
+        for page, metrics in sorted(performance["run"]["pages"].items()):
+            for metric, value in metrics.items():
+                terminalreporter.write_line(page_performance.format_trend(
+                    page, metric, value, previous.get(page, {}).get(metric)
+                ))
+        if performance["run"]["truncated_samples"]:
+            terminalreporter.write_line(
+                f"resource timing buffer full in {performance['run']['truncated_samples']} sample(s): their "
+                f"request_count and transfer_bytes are lower bounds and left out of the medians", yellow=True)
+        for violation in performance["violations"]:
+            terminalreporter.write_line(
+                f"OVER BUDGET {violation['page']} {violation['metric']}: {violation['value']} > {violation['budget']} "
+                f"{violation['unit']} ({violation['url']})"
+            )
+
+    screenshot_stats = config.stash.get(screenshot_stats_key, None)
+    if screenshot_stats and screenshot_stats["captured"]:
+        terminalreporter.write_sep("-", "screenshots")
+        terminalreporter.write_line(
+            f"captured: {screenshot_stats['captured']}, duplicates: {screenshot_stats['duplicates']}, "
+            f"evicted: {screenshot_stats['evicted']}, stored: {screenshot_stats['stored_bytes'] / 1024 / 1024:.1f} MB"
+        )
+        for error in screenshot_stats["errors"]:
+            terminalreporter.write_line(f"not stored: {error}", red=True)
+
+    attachment_errors = config.stash.get(attachment_errors_key, [])
+    if attachment_errors:
+        terminalreporter.write_sep("-", f"allure attachments not written: {len(attachment_errors)}", red=True)
+        for error in attachment_errors:
+            terminalreporter.write_line(error)
+
+    regressions = config.stash.get(timing_regressions_key, None)
+    if regressions is not None:
+        terminalreporter.write_sep("-", f"step timing regressions: {len(regressions)}")
+        for regression in regressions:
+            terminalreporter.write_line(timing.format_regression(regression))
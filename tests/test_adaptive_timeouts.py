@@ -0,0 +1,86 @@
+import json
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from utils import adaptive_timeouts
+from utils.adaptive_timeouts import LatencyHistory
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """Fresh latency history installed for the module functions; the test budget is reset afterwards."""
+    monkeypatch.setattr(adaptive_timeouts, "_history", None)
+    monkeypatch.setattr(adaptive_timeouts, "_budget_deadline", None)
+    return adaptive_timeouts.install(str(tmp_path / "latency.json"))
+
+
+@allure.feature("Adaptive timeouts")
+@allure.title("The default timeout is kept until the wait has enough samples")
+def test_default_until_enough_samples(history):
+    for _ in range(adaptive_timeouts.MIN_SAMPLES - 1):
+        history.record("wait", 1.0)
+    assert history.timeout_for("wait", 10) == 10
+
+    history.record("wait", 1.0)
+    assert history.timeout_for("wait", 10) == 1.0 * adaptive_timeouts.SAFETY_FACTOR
+
+
+@allure.feature("Adaptive timeouts")
+@allure.title("The learned timeout is the 95th percentile times the safety factor, clamped")
+def test_percentile_and_clamping(history):
+    for seconds in range(1, 41):  # 95th percentile 38 s, doubled beyond the maximum
+        history.record("slow", seconds)
+    assert history.timeout_for("slow", 10) == adaptive_timeouts.MAX_TIMEOUT
+
+    for _ in range(adaptive_timeouts.MIN_SAMPLES):
+        history.record("fast", 0.01)
+    assert history.timeout_for("fast", 10) == adaptive_timeouts.MIN_TIMEOUT
+
+    for seconds in range(1, 21):  # The 95th percentile of 20 samples is the 19th
+        history.record("medium", seconds / 10)
+    assert history.timeout_for("medium", 10) == pytest.approx(1.9 * adaptive_timeouts.SAFETY_FACTOR)
+
+
+@allure.feature("Adaptive timeouts")
+@allure.title("A disabled history keeps the default timeouts but still records samples")
+def test_disabled_history(tmp_path):
+    history = LatencyHistory(str(tmp_path / "latency.json"), enabled=False)
+    for _ in range(adaptive_timeouts.MIN_SAMPLES):
+        history.record("wait", 1.0)
+
+    assert history.timeout_for("wait", 10) == 10
+    assert history.new_samples["wait"] == [1.0] * adaptive_timeouts.MIN_SAMPLES
+
+
+@allure.feature("Adaptive timeouts")
+@allure.title("Saving merges the samples of every worker and keeps the newest ones")
+def test_save_merges_and_trims(tmp_path, monkeypatch):
+    monkeypatch.setattr(adaptive_timeouts, "MAX_SAMPLES", 3)
+    path = tmp_path / "latency.json"
+    path.write_text(json.dumps({"wait": [1.0, 2.0], "other": [5.0]}))
+    history = LatencyHistory(str(path))
+    history.record("wait", 3.0)
+
+    history.save([{"wait": [4.0]}, {"new": [0.5]}])
+
+    assert json.loads(path.read_text()) == {"new": [0.5], "other": [5.0], "wait": [2.0, 3.0, 4.0]}
+
+
+@allure.feature("Adaptive timeouts")
+@allure.title("The test budget caps every timeout and fails waits once it is spent")
+def test_budget(history, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(adaptive_timeouts, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    adaptive_timeouts.start_test_budget(5)
+    assert adaptive_timeouts.resolve_timeout("wait", 10) == 5
+    clock[0] += 4
+    assert adaptive_timeouts.resolve_timeout("wait", 10) == 1
+    clock[0] += 1
+    with pytest.raises(adaptive_timeouts.TestBudgetExceeded, match="budget exhausted before wait 'wait'"):
+        adaptive_timeouts.resolve_timeout("wait", 10)
+
+    adaptive_timeouts.end_test_budget()
+    assert adaptive_timeouts.resolve_timeout("wait", 10) == 10
@@ -1,32 +1,14 @@
+from collections import Counter
+
 import pytest
 import allure
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.quality_assurance_page import QualityAssurancePage
+from pages import open_positions_page as open_positions_module
 from pages.open_positions_page import OpenPositionsPage
-
-
-@pytest.fixture(params=["chrome", "firefox"])
-def driver(request):
-    """Initialize the browser driver based on the parameter (Chrome or Firefox)."""
-    if request.param == "chrome":
-        chrome_options = ChromeOptions()
-        chrome_options.add_argument("--disable-notifications")
-        driver = webdriver.Chrome(options=chrome_options)
-    elif request.param == "firefox":
-        firefox_options = FirefoxOptions()
-        firefox_options.set_preference("dom.webnotifications.enabled", False)
-        driver = webdriver.Firefox(options=firefox_options)
-    else:
-        raise ValueError(f"Unsupported browser: {request.param}")
-
-    driver.maximize_window()
-    yield driver
-    driver.quit()
+from utils.step_graph import StepGraph
 
 
 @allure.feature("Insider Careers Testing - Careers Page Validation")
@@ -40,6 +22,7 @@ Test case to verify key steps on the Insider website:
 4. Apply location and department filters on the QA jobs listing.
 5. Confirm navigation to the Lever application form after clicking 'View Role' on a job listing.
 """)
+@pytest.mark.journey
 @pytest.mark.usefixtures("driver")
 def test_insider_careers(driver):
     errors = []  # List to collect errors without halting the test
@@ -58,14 +41,17 @@ def test_insider_careers(driver):
     # Step 2: Verify presence of key blocks on the Careers page
     careers_page = CareersPage(driver)
     with allure.step("Step 2: Verify presence of key blocks on the Careers page"):
-        for block_name in ["teams", "locations", "life_at_insider"]:
+        block_results = careers_page.verify_blocks(["teams", "locations", "life_at_insider"])
+        for block_name, block_result in block_results.items():
             try:
-                careers_page.verify_block_presence(block_name)
+                careers_page.verify_block_presence(block_name, block_result)
             except AssertionError as e:
-                screenshot_path = careers_page.take_screenshot(f"{block_name}_verification_failure")
-                if screenshot_path:
-                    allure.attach.file(screenshot_path, name=f"{block_name.capitalize()} Verification Failure Screenshot", attachment_type=allure.attachment_type.PNG)
+                careers_page.take_screenshot(f"{block_name}_verification_failure")
                 errors.append(f"{block_name.capitalize()} verification error: {str(e)}")
+        try:
+            careers_page.verify_block_visuals(block_results)
+        except AssertionError as e:
+            errors.append(f"Visual regression error: {str(e)}")
 
     # Step 3: Navigate to QA page
     qa_page = QualityAssurancePage(driver)
@@ -74,9 +60,7 @@ def test_insider_careers(driver):
             qa_page.open()
             qa_page.click_see_all_qa_jobs()
         except (TimeoutException, NoSuchElementException) as e:
-            screenshot_path = qa_page.take_screenshot("qa_jobs_navigation_failure")
-            if screenshot_path:
-                allure.attach.file(screenshot_path, name="QA Jobs Navigation Failure Screenshot", attachment_type=allure.attachment_type.PNG)
+            qa_page.take_screenshot("qa_jobs_navigation_failure")
             errors.append(f"QA Jobs navigation error: {str(e)}")
 
     # Step 4: Apply filters and verify job listings
@@ -84,11 +68,9 @@ def test_insider_careers(driver):
     with allure.step("Step 4: Apply filters and verify QA jobs listing"):
         try:
             open_positions_page.apply_filters()
-            open_positions_page.verify_jobs()
+            open_positions_page.verify_listing()
         except (TimeoutException, NoSuchElementException, AssertionError) as e:
-            screenshot_path = open_positions_page.take_screenshot("job_filters_verification_failure")
-            if screenshot_path:
-                allure.attach.file(screenshot_path, name="Job Filters Verification Failure Screenshot", attachment_type=allure.attachment_type.PNG)
+            open_positions_page.take_screenshot("job_filters_verification_failure")
             errors.append(f"Job Filters verification error: {str(e)}")
 
     # Step 5: Click "View Role" and verify navigation to Lever application form page
@@ -104,3 +86,106 @@ def test_insider_careers(driver):
     if errors:
         allure.attach("\n".join(errors), name="Collected Errors", attachment_type=allure.attachment_type.TEXT)
         assert False, "Test failed with errors: " + "; ".join(errors)
+
+
+@allure.feature("Insider Careers Testing - Careers Page Validation")
+@allure.story("Verify blocks and QA job listings entered directly, in parallel tabs")
+@allure.title("Test Insider Careers page blocks and QA job listings")
+@allure.description("""
+Enter the pages directly with the cookie consent already given. The two branches are independent
+and run interleaved in separate tabs of the same browser session:
+- Careers tab: verify the presence of key blocks with expected names on the Careers page.
+- QA jobs tab: apply location and department filters on the QA jobs listing, verify every listed job
+  and confirm navigation to the Lever application form after clicking 'View Role'.
+""")
+@pytest.mark.usefixtures("driver")
+def test_insider_careers_direct(driver):
+    careers_page = CareersPage(driver)
+    open_positions_page = OpenPositionsPage(driver)
+
+    def verify_blocks():
+        block_errors = []
+        block_results = careers_page.verify_blocks(["teams", "locations", "life_at_insider"])
+        for block_name, block_result in block_results.items():
+            try:
+                careers_page.verify_block_presence(block_name, block_result)
+            except AssertionError as e:
+                careers_page.take_screenshot(f"{block_name}_verification_failure")
+                block_errors.append(f"{block_name.capitalize()} verification error: {str(e)}")
+        try:
+            careers_page.verify_block_visuals(block_results)
+        except AssertionError as e:
+            block_errors.append(f"Visual regression error: {str(e)}")
+        assert not block_errors, "; ".join(block_errors)
+
+    def verify_jobs():
+        try:
+            open_positions_page.verify_listing()
+        except (TimeoutException, NoSuchElementException, AssertionError):
+            open_positions_page.take_screenshot("job_filters_verification_failure")
+            raise
+
+    graph = StepGraph(driver)
+    graph.add("Open Careers page directly", start=careers_page.start_enter, ready=careers_page.is_entered)
+    graph.add("Verify presence of key blocks on the Careers page", verify_blocks,
+              depends_on=["Open Careers page directly"])
+    graph.add("Open QA job listings directly", tab="qa_jobs",
+              start=open_positions_page.start_enter, ready=open_positions_page.is_entered)
+    graph.add("Apply filters to the QA job listings", depends_on=["Open QA job listings directly"],
+              start=open_positions_page.start_filters, ready=open_positions_page.filters_applied)
+    graph.add("Verify QA jobs listing", verify_jobs, depends_on=["Apply filters to the QA job listings"])
+    graph.add("Click 'View Role' and verify navigation to Lever application form page",
+              open_positions_page.open_first_job, depends_on=["Verify QA jobs listing"])
+    errors = graph.run()
+
+    # Final assertion to mark test as failed if any step failed
+    if errors:
+        allure.attach("\n".join(errors), name="Collected Errors", attachment_type=allure.attachment_type.TEXT)
+        assert False, "Test failed with errors: " + "; ".join(errors)
+
+
+@allure.feature("Insider Careers Testing - Job Listing Streaming")
+@allure.story("Stream a paginated QA job listing batch by batch")
+@allure.title("Test that every posting of a paginated job listing is streamed exactly once")
+@allure.description("""
+Runs against the local replica with an infinite-scroll job list (--local-site --site-page-size N).
+The filtered QA listing is verified through verify_listing, which must stream it in batches:
+every posting of the replica is read exactly once and the per-batch throughput is attached.
+""")
+@pytest.mark.streaming
+@pytest.mark.usefixtures("driver")
+def test_job_listing_streaming(driver, local_site, monkeypatch):
+    open_positions_page = OpenPositionsPage(driver)
+    location, department = "Istanbul, Turkey", "Quality Assurance"
+    expected = [job["title"] for job in local_site.filter_jobs(location, department)]
+
+    # Record the streamed postings and the attachment names while keeping the real behaviour
+    streamed, attachment_names = [], []
+    iter_job_batches, attach = open_positions_page.iter_job_batches, open_positions_module.attach
+
+    def recording_iter_job_batches(*args, **kwargs):
+        for batch in iter_job_batches(*args, **kwargs):
+            streamed.extend(job["position"] for job in batch)
+            yield batch
+
+    def recording_attach(body, name=None, *args, **kwargs):
+        attachment_names.append(name)
+        return attach(body, name, *args, **kwargs)
+
+    monkeypatch.setattr(open_positions_page, "iter_job_batches", recording_iter_job_batches)
+    monkeypatch.setattr(open_positions_module, "attach", recording_attach)
+
+    open_positions_page.enter()
+    open_positions_page.apply_filters(location, department)
+    summary = open_positions_page.verify_listing(location, department)
+
+    duplicates = sorted(title for title, count in Counter(streamed).items() if count > 1)
+    assert not duplicates, f"Postings streamed more than once: {duplicates}"
+    assert sorted(streamed) == sorted(expected), f"Streamed {len(streamed)} of {len(expected)} postings"
+    assert summary["jobs"] == len(expected) and summary["jobs_per_second"] > 0, f"Unexpected summary: {summary}"
+    assert f"Job Listing Batches ({len(expected)} jobs)" in attachment_names, "Batch throughput was not attached"
+
+    # The same rendered listing streams again in full
+    streamed.clear()
+    assert open_positions_page.verify_listing(location, department)["jobs"] == len(expected)
+    assert sorted(streamed) == sorted(expected), f"Second stream read {len(streamed)} of {len(expected)} postings"
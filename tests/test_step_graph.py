@@ -0,0 +1,116 @@
+import allure
+import pytest
+
+from utils.step_graph import MAIN_TAB, StepGraph
+
+
+class StubSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current_window_handle = handle
+
+    def new_window(self, type_hint=None):
+        self._driver.handles.append(f"tab-{len(self._driver.handles)}")
+        self._driver.current_window_handle = self._driver.handles[-1]
+
+
+class StubDriver:
+    """Driver stand-in with the window handling the scheduler uses."""
+
+    def __init__(self):
+        self.handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.switch_to = StubSwitchTo(self)
+
+
+def fail(message):
+    def run():
+        raise AssertionError(message)
+    return run
+
+
+@allure.feature("Step graph scheduler")
+@allure.title("Steps that depend on a failed step are skipped instead of run")
+def test_dependents_of_failed_step_are_skipped():
+    calls = []
+    graph = StepGraph(StubDriver())
+    graph.add("load", fail("page did not load"))
+    graph.add("filter", lambda: calls.append("filter"), depends_on=["load"])
+    graph.add("open job", lambda: calls.append("open job"), depends_on=["filter"])
+    graph.add("other tab", lambda: calls.append("other tab"), tab="other")
+
+    errors = graph.run()
+
+    assert calls == ["other tab"]
+    assert errors == ["load: page did not load"]
+    assert graph.steps["filter"].state == "skipped"
+    assert graph.steps["filter"].skip_reason == "dependency 'load' failed"
+    assert graph.steps["open job"].skip_reason == "dependency 'load' failed"
+    assert "open job [tab: main] - skipped: dependency 'load' failed" in graph.summary()
+
+
+@allure.feature("Step graph scheduler")
+@allure.title("A step that never becomes ready fails and its dependents are skipped")
+def test_ready_timeout_fails_step():
+    calls = []
+    graph = StepGraph(StubDriver())
+    graph.add("load", start=lambda: calls.append("start"), ready=lambda: False, timeout=0.1)
+    graph.add("verify", lambda: calls.append("verify"), depends_on=["load"])
+
+    errors = graph.run()
+
+    assert calls == ["start"]
+    assert errors == ["load: not ready after 0.1s"]
+    assert graph.steps["verify"].state == "skipped"
+
+
+@allure.feature("Step graph scheduler")
+@allure.title("Every tab is started before the bodies run, and bodies run in the tab that is ready")
+def test_tabs_are_started_first_and_interleaved():
+    driver = StubDriver()
+    events = []
+    ready = {"slow": 0}
+
+    def slow_ready():
+        ready["slow"] += 1
+        return ready["slow"] > 2
+
+    graph = StepGraph(driver)
+    graph.add("open slow", start=lambda: events.append(("start slow", driver.current_window_handle)),
+              ready=slow_ready)
+    graph.add("verify slow", lambda: events.append(("verify slow", driver.current_window_handle)),
+              depends_on=["open slow"])
+    graph.add("open fast", tab="fast", start=lambda: events.append(("start fast", driver.current_window_handle)))
+    graph.add("verify fast", lambda: events.append(("verify fast", driver.current_window_handle)),
+              depends_on=["open fast"])
+
+    assert graph.run() == []
+    assert events == [("start slow", "tab-0"), ("start fast", "tab-1"), ("verify fast", "tab-1"),
+                      ("verify slow", "tab-0")]
+    assert graph.steps["verify fast"].tab == "fast"
+
+
+@allure.feature("Step graph scheduler")
+@allure.title("A body that moves to another window keeps its tab pointed at that window")
+def test_step_follows_window_opened_by_body():
+    driver = StubDriver()
+    graph = StepGraph(driver)
+    graph.add("open posting", lambda: driver.switch_to.new_window("tab"))
+    graph.add("other tab", lambda: None, tab="other")
+    graph.add("check posting", lambda: None, depends_on=["open posting"])
+
+    assert graph.run() == []
+    assert graph._handles[MAIN_TAB] == "tab-1"
+
+
+@allure.feature("Step graph scheduler")
+@allure.title("Duplicate steps and unknown dependencies are rejected")
+def test_add_validates_steps():
+    graph = StepGraph(StubDriver())
+    graph.add("load")
+    with pytest.raises(ValueError, match="Duplicate step"):
+        graph.add("load")
+    with pytest.raises(ValueError, match="unknown steps: missing"):
+        graph.add("verify", depends_on=["missing"])
@@ -0,0 +1,76 @@
+import json
+
+import allure
+
+from utils import timing
+
+
+def report(*steps, nodeid="tests/test_insider.py::test_flow"):
+    """Timing report with one test whose steps are (path, wall_time, commands) tuples."""
+    return {"tests": {nodeid: [{"step": path, "path": path, "wall_time": wall_time, "commands": commands,
+                                "sleep_time": 0.0, "wait_time": 0.0} for path, wall_time, commands in steps]}}
+
+
+@allure.feature("Step timings")
+@allure.title("Steps above the relative threshold and the minimum increase are reported")
+def test_compare_thresholds():
+    baseline = report(("open", 1.0, 10), ("filter", 0.2, 5), ("verify", 2.0, 20))
+    current = report(("open", 1.5, 10), ("filter", 0.28, 5), ("verify", 2.3, 25))
+
+    regressions = timing.compare(current, baseline, threshold=0.2, min_delta=0.1)
+
+    # open: +50% wall time; filter: +40% but only 0.08 s (jitter); verify: +15% wall time, +25% commands
+    assert [(r["step"], r["metric"]) for r in regressions] == [("open", "wall_time"), ("verify", "commands")]
+    assert regressions[0]["change"] == 0.5
+    assert regressions[1] == {"test": "tests/test_insider.py::test_flow", "step": "verify", "metric": "commands",
+                              "baseline": 20, "current": 25, "change": 0.25}
+
+
+@allure.feature("Step timings")
+@allure.title("Steps and tests missing from the baseline are not compared")
+def test_compare_ignores_unmatched_steps():
+    baseline = report(("open", 1.0, 10))
+    current = report(("open", 1.0, 10), ("new step", 9.0, 90))
+    current["tests"]["tests/test_insider.py::test_other"] = report(("open", 9.0, 90))["tests"].popitem()[1]
+
+    assert timing.compare(current, baseline) == []
+
+
+@allure.feature("Step timings")
+@allure.title("A metric that was zero in the baseline is reported as new")
+def test_compare_from_zero():
+    regressions = timing.compare(report(("open", 0.0, 3)), report(("open", 0.0, 0)))
+
+    assert regressions[0]["change"] is None
+    assert timing.format_regression(regressions[0]) == "tests/test_insider.py::test_flow :: open: commands 0 -> 3 (new)"
+
+
+@allure.feature("Step timings")
+@allure.title("Repeated steps get numbered paths and parents include the commands of nested steps")
+def test_instrumentation_paths_and_nesting():
+    instrumentation = timing.Instrumentation()
+    instrumentation.begin_test("test")
+    for uuid in ("a", "b"):
+        instrumentation.start_step(uuid, "Apply filters")
+        instrumentation.start_step(uuid + "-inner", "Wait")
+        instrumentation.record_command()
+        instrumentation.stop_step(uuid + "-inner")
+        instrumentation.record_command()
+        instrumentation.stop_step(uuid)
+    instrumentation.end_test()
+
+    commands = {step["path"]: step["commands"] for step in instrumentation.tests["test"]}
+    assert commands == {"Apply filters > Wait": 1, "Apply filters": 2, "Apply filters #2 > Wait": 1,
+                        "Apply filters #2": 2, timing.TEST_STEP: 4}
+
+
+@allure.feature("Step timings")
+@allure.title("The compare command exits with 1 when it finds regressions")
+def test_main_exit_code(tmp_path, capsys):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(report(("open", 1.0, 10))))
+    current.write_text(json.dumps(report(("open", 2.0, 10))))
+
+    assert timing.main(["compare", str(current), str(baseline)]) == 1
+    assert "1 regression(s) found" in capsys.readouterr().out
+    assert timing.main(["compare", str(baseline), str(baseline)]) == 0
@@ -0,0 +1,68 @@
+import json
+
+import allure
+
+from utils.verification_cache import VerificationCache
+
+
+@allure.feature("Verification cache")
+@allure.title("Only an unchanged fingerprint in incremental mode returns the stored results")
+def test_lookup(tmp_path):
+    cache = VerificationCache(str(tmp_path / "cache.json"), incremental=True)
+    cache.store("jobs", "abc", {"jobs": 3})
+
+    assert cache.lookup("jobs", "abc") == {"jobs": 3}
+    assert cache.lookup("jobs", "def") is None
+    assert cache.lookup("jobs", None) is None
+    assert cache.lookup("blocks", "abc") is None
+
+    cache.incremental = False
+    assert cache.lookup("jobs", "abc") is None
+
+
+@allure.feature("Verification cache")
+@allure.title("A failed verification hides the entry loaded from the file")
+def test_invalidate_hides_stored_entry(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"jobs": {"fingerprint": "abc", "data": {"jobs": 3}, "verified_at": "earlier"}}))
+    cache = VerificationCache(str(path), incremental=True)
+    assert cache.lookup("jobs", "abc") == {"jobs": 3}
+
+    cache.invalidate("jobs")
+
+    assert cache.lookup("jobs", "abc") is None
+
+
+@allure.feature("Verification cache")
+@allure.title("A verification without a fingerprint is never stored")
+def test_store_without_fingerprint(tmp_path):
+    cache = VerificationCache(str(tmp_path / "cache.json"), incremental=True)
+    cache.store("blocks", None, {"teams": "Teams"})
+
+    assert "blocks" not in cache.updates
+
+
+@allure.feature("Verification cache")
+@allure.title("Saving merges the updates of every worker and drops invalidated entries")
+def test_save_merges_worker_updates(tmp_path):
+    path = tmp_path / "cache.json"
+    entry = {"fingerprint": "abc", "data": None, "verified_at": "earlier"}
+    path.write_text(json.dumps({"kept": entry, "failed": entry, "replaced": entry}))
+    cache = VerificationCache(str(path))
+    cache.store("new", "def")
+
+    cache.save([{"failed": None}, {"replaced": dict(entry, fingerprint="xyz")}])
+
+    saved = json.loads(path.read_text())
+    assert sorted(saved) == ["kept", "new", "replaced"]
+    assert saved["replaced"]["fingerprint"] == "xyz"
+    assert saved["new"]["fingerprint"] == "def"
+
+
+@allure.feature("Verification cache")
+@allure.title("Skipped verifications are recorded for the run summary")
+def test_record_skip(tmp_path):
+    cache = VerificationCache(str(tmp_path / "cache.json"), incremental=True)
+    cache.record_skip("jobs", "job card field assertions")
+
+    assert cache.skipped == [{"key": "jobs", "skipped": "job card field assertions"}]
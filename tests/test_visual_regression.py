@@ -0,0 +1,130 @@
+import allure
+import pytest
+
+from utils import visual_regression
+
+pytestmark = pytest.mark.skipif(not visual_regression.is_available(),
+                                reason="Visual regression requires the numpy and Pillow packages")
+
+if visual_regression.is_available():
+    import numpy as np
+
+
+def white(height=400, width=200):
+    return np.full((height, width, 3), 255, dtype=np.uint8)
+
+
+def page(seed=0):
+    """Light gray capture with dark text-like boxes."""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((400, 200, 3), 200, dtype=np.uint8)
+    for _ in range(60):
+        y, x = rng.integers(0, 390), rng.integers(0, 180)
+        pixels[y:y + 6, x:x + 20] = rng.integers(0, 120)
+    return pixels
+
+
+def png(pixels):
+    return visual_regression.encode(pixels)
+
+
+@allure.feature("Visual regression")
+@allure.title("Masks given as fractions cover the matching pixel rows and columns")
+def test_mask_array():
+    masked = visual_regression.mask_array((10, 20, 3), [(0, 0.3, 1, 0.4), (0.5, 0, 0.25, 0.1)])
+
+    assert masked.shape == (10, 20)
+    assert masked[3:7].all()
+    assert not masked[7:].any()
+    assert masked[0, 10:15].all()
+    assert not masked[0, :10].any() and not masked[0, 15:].any()
+    assert not masked[1:3].any()
+    assert not visual_regression.mask_array((10, 20, 3), []).any()
+
+
+@allure.feature("Visual regression")
+@allure.title("A capture identical outside the masked regions stops at the first stage")
+def test_identical_outside_masks():
+    capture = page()
+    capture[:100] = 0  # Dynamic content in the masked top quarter
+
+    result = visual_regression.compare(png(page()), png(capture), masks=[(0, 0, 1, 0.25)])
+
+    assert result["stage"] == "identical"
+    assert result["similarity"] == 1.0
+    assert result["fast_path"] and result["diff_png"] is None
+
+
+@allure.feature("Visual regression")
+@allure.title("A full-width dark band over half of a white capture fails in the perceptual stage")
+def test_band_fails_fast():
+    band = white()
+    band[200:] = 0
+
+    result = visual_regression.compare(png(white()), png(band))
+
+    assert result["stage"] == "layout"
+    assert result["hash_distance"] > 0
+    assert result["similarity"] < visual_regression.DEFAULT_THRESHOLD
+    assert result["changed_pixels"] is None and result["diff_png"] is None
+
+
+@allure.feature("Visual regression")
+@allure.title("Low-amplitude noise passes the full-size comparison")
+def test_noise_passes():
+    noise = np.random.default_rng(1).integers(-3, 4, size=(400, 200, 3))
+    capture = np.clip(page().astype(int) + noise, 0, 255).astype(np.uint8)
+
+    result = visual_regression.compare(png(page()), png(capture))
+
+    assert result["stage"] == "pixels"
+    assert result["similarity"] == 1.0 and result["changed_pixels"] == 0
+
+
+@allure.feature("Visual regression")
+@allure.title("Shifted text that averages out in the downscaled copies still fails the full-size comparison")
+def test_shifted_text_fails(tmp_path):
+    rng = np.random.default_rng(2)
+    baseline = np.full((800, 1600, 3), 255, dtype=np.uint8)
+    for x in range(100, 900, 6):  # Glyph-like vertical and horizontal strokes along one text row
+        baseline[100 + rng.integers(0, 10):140 - rng.integers(0, 10), x:x + 3] = 0
+        baseline[100 + rng.integers(0, 40), x:x + 6] = 0
+    capture = np.full_like(baseline, 255)
+    capture[100:140, 103:903] = baseline[100:140, 100:900]
+
+    result = visual_regression.compare(png(baseline), png(capture))
+
+    assert result["stage"] == "pixels"
+    assert result["similarity"] < visual_regression.DEFAULT_THRESHOLD
+    store = visual_regression.BaselineStore(str(tmp_path))
+    store.check("chrome", "text", png(baseline))
+    assert not store.check("chrome", "text", png(capture))["passed"]
+
+
+@allure.feature("Visual regression")
+@allure.title("A small change runs the full-size comparison and counts the changed pixels")
+def test_small_change_is_diffed():
+    capture = page()
+    capture[50:60, 10:60] = 0
+
+    result = visual_regression.compare(png(page()), png(capture))
+
+    assert result["stage"] == "pixels"
+    assert result["changed_pixels"] == np.count_nonzero((page()[50:60, 10:60] != 0).any(axis=2))
+    assert result["similarity"] == round(1 - result["changed_pixels"] / (400 * 200), 6)
+    diff = visual_regression.decode(result["diff_png"])
+    assert (diff[50:60, 10:60] == (255, 0, 0)).all(axis=2).any()
+
+
+@allure.feature("Visual regression")
+@allure.title("The baseline store creates missing baselines and fails layout changes and resized captures")
+def test_baseline_store(tmp_path):
+    store = visual_regression.BaselineStore(str(tmp_path))
+    band = white()
+    band[:200] = 0
+
+    assert store.check("chrome", "block", png(white()))["baseline_created"]
+    assert store.check("chrome", "block", png(white()))["passed"]
+    assert not store.check("chrome", "block", png(band))["passed"]
+    resized = store.check("chrome", "block", png(white(410)))
+    assert resized["size_changed"] and not resized["passed"]
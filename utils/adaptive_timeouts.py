@@ -0,0 +1,129 @@
+"""
+Adaptive timeouts learned from historical wait latencies, and per-test time budgets.
+
+Every named wait records how long it actually took. Once a wait has enough history, its timeout
+becomes a high percentile of the recorded latencies times a safety factor, instead of a magic
+number. A per-test budget caps every timeout by the time the test has left, and fails waits
+immediately once the budget is spent.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException
+
+DEFAULT_HISTORY_FILE = ".latency_history.json"
+
+# Samples kept per wait, samples needed before the history is trusted, and how timeouts are derived
+MAX_SAMPLES = 200
+MIN_SAMPLES = 5
+PERCENTILE = 0.95
+SAFETY_FACTOR = 2.0
+MIN_TIMEOUT = 1.0
+MAX_TIMEOUT = 60.0
+
+_history = None
+_budget_deadline = None
+
+
+class TestBudgetExceeded(TimeoutException):
+    """Raised by a wait when the test has used up its overall time budget."""
+
+
+class LatencyHistory:
+    """
+    Latency samples per named wait, stored in a local JSON file.
+
+    :param path: JSON file with {wait name: [seconds, ...]}; page objects qualify the names with the site
+                 and browser (see BasePage.wait_key).
+    :param enabled: When False, waits keep their default timeouts (samples are still recorded).
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_FILE, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.samples = defaultdict(list)
+        self.new_samples = defaultdict(list)
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.samples.update(json.load(file))
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.new_samples[name].append(round(seconds, 4))
+
+    def timeout_for(self, name, default):
+        """
+        Return the learned timeout for a wait, or `default` while there is not enough history.
+        """
+        with self._lock:
+            samples = self.samples.get(name, []) + self.new_samples.get(name, [])
+        if not self.enabled or len(samples) < MIN_SAMPLES:
+            return default
+        ordered = sorted(samples)
+        percentile = ordered[min(len(ordered) - 1, math.ceil(PERCENTILE * len(ordered)) - 1)]
+        return min(max(percentile * SAFETY_FACTOR, MIN_TIMEOUT), MAX_TIMEOUT)
+
+    def save(self, extra_samples=()):
+        """
+        Append the samples of this run (and of other processes, e.g. xdist workers) to the history file.
+
+        :param extra_samples: Iterable of {wait name: [seconds, ...]} dictionaries.
+        """
+        merged = {name: list(samples) for name, samples in self.samples.items()}
+        for new_samples in [self.new_samples, *extra_samples]:
+            for name, samples in new_samples.items():
+                merged[name] = (merged.get(name, []) + samples)[-MAX_SAMPLES:]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(merged, file, indent=2, sort_keys=True)
+
+
+def install(path=DEFAULT_HISTORY_FILE, enabled=True):
+    """Load the latency history used by the page objects for this process."""
+    global _history
+    _history = LatencyHistory(path, enabled)
+    return _history
+
+
+def get_history():
+    return _history
+
+
+def start_test_budget(seconds):
+    """Start the overall time budget of the current test (None disables the budget)."""
+    global _budget_deadline
+    _budget_deadline = time.monotonic() + seconds if seconds else None
+
+
+def end_test_budget():
+    global _budget_deadline
+    _budget_deadline = None
+
+
+def resolve_timeout(name, default):
+    """
+    Return the timeout to use for a named wait: learned from history when possible,
+    and never longer than what is left of the test budget.
+
+    :raises TestBudgetExceeded: If the test budget is already spent.
+    """
+    timeout = _history.timeout_for(name, default) if _history is not None else default
+    if _budget_deadline is not None:
+        remaining = _budget_deadline - time.monotonic()
+        if remaining <= 0:
+            raise TestBudgetExceeded(f"Test time budget exhausted before wait '{name}'")
+        timeout = min(timeout, remaining)
+    return timeout
+
+
+def record(name, seconds):
+    """Record how long a named wait took to succeed."""
+    if _history is not None:
+        _history.record(name, seconds)
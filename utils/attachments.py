@@ -0,0 +1,177 @@
+import queue
+import threading
+
+import allure
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.types import AttachmentType
+
+# Text attachments up to this many characters are buffered and merged per step
+SMALL_TEXT_LIMIT = 2048
+
+_buffer = None
+_writer = None
+_replaced_logger = None
+
+
+class BackgroundAllureFileLogger(AllureFileLogger):
+    """
+    Allure file logger that writes attachment files on a background thread.
+
+    Attachment metadata is still registered synchronously by the allure listener, so every
+    attachment stays linked to the right step; only the file I/O leaves the test thread.
+    """
+
+    def __init__(self, report_dir):
+        super().__init__(report_dir)
+        self._queue = queue.Queue()
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, name="allure-attachment-writer", daemon=True)
+        self._thread.start()
+
+    @allure_commons.hookimpl
+    def report_attached_file(self, source, file_name):
+        self._queue.put((super().report_attached_file, source, file_name))
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        self._queue.put((super().report_attached_data, body, file_name))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                write, payload, file_name = item
+                write(payload, file_name)
+            except Exception as e:  # Keep the writer alive, or flush() would wait forever
+                self.errors.append(f"{item[2]}: {type(e).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued attachment has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the remaining attachments and stop the writer thread."""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+
+class StepAttachmentBuffer:
+    """
+    Collects small text attachments for the currently running allure step.
+
+    When the step stops (successfully or with an error) the buffered entries are attached
+    as a single merged text attachment, before the allure listener closes the step.
+    """
+
+    def __init__(self):
+        self._frames = [(None, [])]
+
+    def add(self, body, name):
+        self._frames[-1][1].append((name, body))
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid):
+        self._frames.append((uuid, []))
+
+    @allure_commons.hookimpl(tryfirst=True)
+    def stop_step(self, uuid):
+        while len(self._frames) > 1:
+            frame_uuid, entries = self._frames.pop()
+            self._attach_merged(entries)
+            if frame_uuid == uuid:
+                break
+
+    def flush_test(self):
+        """Attach the entries buffered outside of any step to the test itself."""
+        entries = self._frames[0][1]
+        self._frames = [(None, [])]
+        self._attach_merged(entries)
+
+    @staticmethod
+    def _attach_merged(entries):
+        if not entries:
+            return
+        if len(entries) == 1:
+            name, body = entries[0]
+            allure.attach(body, name=name, attachment_type=AttachmentType.TEXT)
+            return
+        merged = "\n\n".join(f"[{name}]\n{body}" for name, body in entries)
+        allure.attach(merged, name=f"Step Log ({len(entries)} entries)", attachment_type=AttachmentType.TEXT)
+
+
+def attach(body, name=None, attachment_type=None, extension=None):
+    """
+    Drop-in replacement for allure.attach used by the page objects.
+
+    Small text attachments are buffered and merged per step; anything else is attached
+    immediately, with the file written by the background writer.
+    """
+    is_text = attachment_type in (None, AttachmentType.TEXT)
+    if _buffer is not None and is_text and isinstance(body, str) and len(body) <= SMALL_TEXT_LIMIT:
+        _buffer.add(body, name)
+        return
+    allure.attach(body, name=name, attachment_type=attachment_type, extension=extension)
+
+
+def install():
+    """
+    Replace the allure file logger with the background writer and enable step buffering.
+
+    Does nothing when allure results are not being written (no --alluredir).
+
+    :return: The installed BackgroundAllureFileLogger, or None.
+    """
+    global _buffer, _writer, _replaced_logger
+    plugin_manager = allure_commons.plugin_manager
+    for plugin in plugin_manager.get_plugins():
+        if type(plugin) is AllureFileLogger:
+            plugin_manager.unregister(plugin)
+            _replaced_logger = plugin
+            _writer = BackgroundAllureFileLogger(plugin._report_dir)
+            plugin_manager.register(_writer)
+            _buffer = StepAttachmentBuffer()
+            plugin_manager.register(_buffer)
+            return _writer
+    return None
+
+
+def flush_test():
+    """Attach any buffered test-level entries; called once the test body has finished."""
+    if _buffer is not None:
+        _buffer.flush_test()
+
+
+def flush():
+    """Block until the attachment files queued so far have been written; called after every test."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def uninstall():
+    """
+    Stop buffering, write every queued attachment and restore the original allure file logger.
+
+    :return: Errors of the attachments that could not be written, as '<file name>: <error>' strings.
+    """
+    global _buffer, _writer, _replaced_logger
+    plugin_manager = allure_commons.plugin_manager
+    errors = []
+    if _buffer is not None:
+        plugin_manager.unregister(_buffer)
+        _buffer = None
+    if _writer is not None:
+        plugin_manager.unregister(_writer)
+        _writer.close()
+        errors = _writer.errors
+        _writer = None
+    if _replaced_logger is not None:
+        # Allure's own cleanup expects its logger to still be registered at unconfigure time
+        plugin_manager.register(_replaced_logger)
+        _replaced_logger = None
+    return errors
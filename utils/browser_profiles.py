@@ -0,0 +1,329 @@
+"""
+Browser profiles: headless mode, page-load strategy and request blocking for Chrome and Firefox.
+
+Domain blocking uses a generated PAC (proxy auto-config) script in both browsers: allowlisted
+hosts go direct, blocked hosts are routed to a closed local port and fail immediately. Resource
+types are blocked through CDP (Network.setBlockedURLs) in Chrome and through preferences in Firefox.
+The CDP setting only applies to one tab, so it is applied again to every tab the tests open.
+"""
+import base64
+import json
+import statistics
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# Hosts the careers blocks, the jobs list and the Lever postings need to render
+DEFAULT_ALLOWED_DOMAINS = (
+    "useinsider.com",
+    "lever.co",
+    "code.jquery.com",
+    "cdnjs.cloudflare.com",
+    "cdn.jsdelivr.net",
+    "ajax.googleapis.com",
+    "localhost",
+    "127.0.0.1",
+)
+
+# Analytics, advertising and chat widgets loaded by the marketing site
+THIRD_PARTY_DOMAINS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "linkedin.com",
+    "licdn.com",
+    "hubspot.com",
+    "hs-scripts.com",
+    "hs-analytics.net",
+    "hsforms.net",
+    "intercom.io",
+    "drift.com",
+    "clarity.ms",
+    "bing.com",
+    "twitter.com",
+    "youtube.com",
+    "vimeo.com",
+)
+
+# URL patterns used by Chrome to block each resource type; the trailing wildcard also matches
+# versioned URLs such as logo.png?ver=3
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.ogg*", "*.mp3*"],
+}
+
+# Firefox preferences used to block each resource type
+RESOURCE_TYPE_FIREFOX_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "font": {"gfx.downloadable_fonts.enabled": False, "browser.display.use_document_fonts": 0},
+    "media": {"media.autoplay.default": 5, "media.autoplay.blocking_policy": 2},
+}
+
+# Closed local port that blocked hosts are routed to by the PAC script
+BLACKHOLE_PROXY = "PROXY 127.0.0.1:9"
+
+
+class BrowserProfile:
+    """
+    Describes how a browser is launched and which requests it blocks.
+
+    :param name: Profile name used in reports.
+    :param headless: Run the browser without a window.
+    :param page_load_strategy: 'normal', 'eager' (return at DOMContentLoaded) or 'none'.
+    :param block_domains: Hosts (and their subdomains) whose requests are blocked.
+    :param block_third_party: Block every host that is not in the allowlist.
+    :param block_resource_types: Any of 'image', 'font' and 'media'.
+    :param allow_domains: Hosts that are never blocked.
+    """
+
+    def __init__(self, name, headless=False, page_load_strategy="normal", block_domains=(),
+                 block_third_party=False, block_resource_types=(), allow_domains=DEFAULT_ALLOWED_DOMAINS):
+        unknown_types = set(block_resource_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown_types:
+            raise ValueError(f"Unsupported resource types: {sorted(unknown_types)}")
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_domains = tuple(block_domains)
+        self.block_third_party = block_third_party
+        self.block_resource_types = tuple(block_resource_types)
+        self.allow_domains = tuple(allow_domains)
+
+    def with_allowed_domains(self, domains):
+        """Return a copy of the profile with extra allowlisted hosts."""
+        return BrowserProfile(self.name, self.headless, self.page_load_strategy, self.block_domains,
+                              self.block_third_party, self.block_resource_types,
+                              self.allow_domains + tuple(domains))
+
+    @property
+    def blocks_domains(self):
+        return bool(self.block_domains) or self.block_third_party
+
+    def pac_url(self):
+        """Return a data: URL with the PAC script implementing the domain allowlist/blocklist."""
+        script = f"""
+function FindProxyForURL(url, host) {{
+    var allow = {json.dumps(list(self.allow_domains))};
+    var block = {json.dumps(list(self.block_domains))};
+    function matches(domains) {{
+        for (var i = 0; i < domains.length; i++) {{
+            if (host === domains[i] || dnsDomainIs(host, "." + domains[i])) return true;
+        }}
+        return false;
+    }}
+    if (matches(allow)) return "DIRECT";
+    if ({str(self.block_third_party).lower()} || matches(block)) return "{BLACKHOLE_PROXY}";
+    return "DIRECT";
+}}"""
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        return f"data:application/x-ns-proxy-autoconfig;base64,{encoded}"
+
+    def apply_to_chrome_options(self, options):
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+        if self.blocks_domains:
+            options.add_argument(f"--proxy-pac-url={self.pac_url()}")
+        if "image" in self.block_resource_types:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+
+    def apply_to_firefox_options(self, options):
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("-headless")
+            options.add_argument("--width=1920")
+            options.add_argument("--height=1080")
+        if self.blocks_domains:
+            options.set_preference("network.proxy.type", 2)
+            options.set_preference("network.proxy.autoconfig_url", self.pac_url())
+        for resource_type in self.block_resource_types:
+            for name, value in RESOURCE_TYPE_FIREFOX_PREFS[resource_type].items():
+                options.set_preference(name, value)
+
+    def apply_to_session(self, driver):
+        """
+        Apply the settings that need a running session (Chrome resource-type blocking over CDP).
+        The patterns are kept on the driver, so block_resources_in_window can apply them to new tabs.
+        """
+        if self.block_resource_types and hasattr(driver, "execute_cdp_cmd"):
+            driver.blocked_url_patterns = [pattern for resource_type in self.block_resource_types
+                                           for pattern in RESOURCE_TYPE_PATTERNS[resource_type]]
+            block_resources_in_window(driver)
+
+
+def block_resources_in_window(driver):
+    """
+    Apply the profile's resource-type blocking to the current tab. Chrome's CDP blocking only covers
+    the tab it was set in, so this is needed after switching to every newly opened tab.
+
+    :return: True if the profile blocks resource types in this browser.
+    """
+    patterns = getattr(driver, "blocked_url_patterns", None)
+    if not patterns:
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return True
+
+
+PROFILES = {
+    # Today's behaviour: maximized headed window, full page loads, nothing blocked
+    "default": BrowserProfile("default"),
+    "headless": BrowserProfile("headless", headless=True),
+    "eager": BrowserProfile("eager", headless=True, page_load_strategy="eager", block_domains=THIRD_PARTY_DOMAINS),
+    "lean": BrowserProfile("lean", headless=True, page_load_strategy="eager", block_third_party=True,
+                           block_resource_types=("image", "font", "media")),
+    "none": BrowserProfile("none", headless=True, page_load_strategy="none", block_third_party=True,
+                           block_resource_types=("image", "font", "media")),
+}
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile: {name}. Available profiles: {', '.join(PROFILES)}")
+
+
+# Returns the URL and Navigation Timing of the current document: milliseconds from the start of the
+# navigation to the end of DOMContentLoaded and of the load event, null until the event has ended.
+# Unlike the time driver.get blocks, these are comparable across page load strategies.
+LOAD_TIMING_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const end = value => (navigation && value > 0 ? Math.round(value) : null);
+return {
+    url: document.URL,
+    dom_content_loaded_ms: navigation ? end(navigation.domContentLoadedEventEnd) : null,
+    load_ms: navigation ? end(navigation.loadEventEnd) : null
+};
+"""
+
+
+class PageLoadRecorder:
+    """
+    Collects page load timings per browser profile and page.
+
+    With the eager and none strategies driver.get returns before the load event, so a load is tracked
+    per tab of the driver until its timings are known: right after driver.get when the load has already
+    ended, otherwise when the page is about to be left. A document left before its load event is
+    recorded with a load_ms of None.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loads = defaultdict(lambda: defaultdict(list))
+
+    def record(self, profile_name, url, timings):
+        """
+        :param timings: Dictionary with 'dom_content_loaded_ms' and 'load_ms' (None when not reached).
+        """
+        with self._lock:
+            self.loads[profile_name][url].append(timings)
+
+    def track(self, driver, url, target):
+        """
+        Start tracking the load of a page just opened with driver.get.
+
+        :param url: Name of the page in the report (its live URL).
+        :param target: URL actually opened, used to recognize the document.
+        """
+        if not hasattr(driver, "pending_page_loads"):
+            driver.pending_page_loads = {}
+        driver.pending_page_loads[driver.current_window_handle] = (url, target)
+        self.finish(driver, leaving=False)
+
+    def finish(self, driver, leaving=True):
+        """
+        Record the tracked load of the current tab once its timings are known.
+
+        :param leaving: The page is about to be left, so the timings are recorded even if the load has not ended.
+        """
+        pending_loads = getattr(driver, "pending_page_loads", None)
+        if not pending_loads:
+            return
+        handle = driver.current_window_handle
+        if handle in pending_loads:
+            self._settle(driver, handle, self._read_timings(driver), leaving)
+
+    def finish_all(self, driver):
+        """Record the loads still tracked in every tab of the driver, e.g. when a test ends."""
+        for handle in list(getattr(driver, "pending_page_loads", None) or ()):
+            try:
+                driver.switch_to.window(handle)
+            except Exception:  # The tab was closed: its load can no longer be measured
+                self._settle(driver, handle, None, leaving=True)
+            else:
+                self._settle(driver, handle, self._read_timings(driver), leaving=True)
+
+    @staticmethod
+    def _read_timings(driver):
+        try:
+            return driver.execute_script(LOAD_TIMING_SCRIPT)
+        except Exception:
+            return None
+
+    def _settle(self, driver, handle, timings, leaving):
+        url, target = driver.pending_page_loads[handle]
+        # Right after driver.get with the none strategy, the previous document may still be current
+        same_document = timings is not None and _same_page(timings["url"], target)
+        if not leaving and (not same_document or timings["load_ms"] is None):
+            return
+        del driver.pending_page_loads[handle]
+        if not same_document:
+            timings = {"dom_content_loaded_ms": None, "load_ms": None}
+        self.record(getattr(driver, "browser_profile", "default"), url,
+                    {"dom_content_loaded_ms": timings["dom_content_loaded_ms"], "load_ms": timings["load_ms"]})
+
+    def to_dict(self):
+        with self._lock:
+            return {profile: {url: list(samples) for url, samples in pages.items()}
+                    for profile, pages in self.loads.items()}
+
+
+def _same_page(document_url, target):
+    """Compare URLs without their query, fragment and trailing slash (redirects may change them)."""
+    document, expected = urlsplit(document_url), urlsplit(target)
+    return (document.netloc, document.path.rstrip("/")) == (expected.netloc, expected.path.rstrip("/"))
+
+
+def summarize_page_loads(samples):
+    """
+    :param samples: Timings recorded for one page.
+    :return: Dictionary with the mean 'dom_content_loaded_ms' and 'load_ms' over the loads that reached
+             the event (None if none did), the number of 'loads' and the number left 'unfinished'.
+    """
+    def mean(metric):
+        values = [sample[metric] for sample in samples if sample[metric] is not None]
+        return statistics.mean(values) if values else None
+
+    return {"dom_content_loaded_ms": mean("dom_content_loaded_ms"), "load_ms": mean("load_ms"),
+            "loads": len(samples), "unfinished": sum(1 for sample in samples if sample["load_ms"] is None)}
+
+
+def format_page_loads(summary):
+    """Describe a summarize_page_loads() result, e.g. 'DOMContentLoaded 640 ms, load 1840 ms over 3 load(s)'."""
+    timings = ", ".join(f"{label} {summary[metric]:.0f} ms" if summary[metric] is not None else f"{label} -"
+                        for label, metric in (("DOMContentLoaded", "dom_content_loaded_ms"), ("load", "load_ms")))
+    line = f"{timings} over {summary['loads']} load(s)"
+    if summary["unfinished"]:
+        line += f" ({summary['unfinished']} left before the load event)"
+    return line
+
+
+page_loads = PageLoadRecorder()
+
+
+def merge_page_loads(results):
+    """Merge several PageLoadRecorder.to_dict results (e.g. one per xdist worker)."""
+    merged = defaultdict(lambda: defaultdict(list))
+    for result in results:
+        for profile, pages in result.items():
+            for url, samples in pages.items():
+                merged[profile][url].extend(samples)
+    return merged
@@ -0,0 +1,153 @@
+"""
+Fast driver bootstrap: driver binary paths cached per machine, and timed session start-up.
+
+Without a driver path, every webdriver.Chrome/webdriver.Firefox call runs Selenium Manager to
+resolve the driver and browser binaries (a subprocess call, plus downloads on a cold cache).
+The resolved paths are cached in a JSON file in the user's cache directory and passed to the
+driver service directly while the files still exist. A session that fails to start with cached
+paths, e.g. after a browser update, is retried once after a fresh resolution.
+
+Start-up is split into timed phases: binary resolution, driver process launch (chromedriver or
+geckodriver) and session creation, which includes starting the browser itself.
+"""
+import json
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "useinsider-tests", "driver_paths.json")
+
+# Cached paths are resolved again after this many seconds, to pick up driver updates
+CACHE_TTL = 7 * 24 * 3600
+
+BROWSERS = {
+    "chrome": (ChromeService, webdriver.Chrome),
+    "firefox": (FirefoxService, webdriver.Firefox),
+}
+
+
+class DriverPathCache:
+    """
+    Driver and browser binary paths per browser, stored in a JSON file shared by all runs on the machine.
+
+    :param path: JSON file with {browser: {driver_path, browser_path, resolved_at}}.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Write to a temporary file first, so parallel workers never read a partial file
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+    def get(self, browser):
+        """Return the cached paths of a browser, or None if they are missing, stale or no longer exist."""
+        with self._lock:
+            entry = self._load().get(browser)
+        if not entry or time.time() - entry.get("resolved_at", 0) > CACHE_TTL:
+            return None
+        if not os.path.isfile(entry["driver_path"]):
+            return None
+        if entry.get("browser_path") and not os.path.isfile(entry["browser_path"]):
+            return None
+        return entry
+
+    def put(self, browser, driver_path, browser_path):
+        with self._lock:
+            entries = self._load()
+            entries[browser] = {"driver_path": driver_path, "browser_path": browser_path, "resolved_at": time.time()}
+            self._write(entries)
+
+    def invalidate(self, browser):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(browser, None) is not None:
+                self._write(entries)
+
+
+_cache = DriverPathCache()
+
+
+def configure(path=DEFAULT_CACHE_FILE):
+    """Use another cache file for the driver paths of this process."""
+    global _cache
+    _cache = DriverPathCache(path)
+    return _cache
+
+
+def resolve(browser, options, refresh=False):
+    """
+    Return the driver and browser binary paths for a browser, from the cache when possible.
+
+    :param browser: Either 'chrome' or 'firefox'.
+    :param options: Browser options (Selenium Manager takes the browser version and binary from them).
+    :param refresh: Resolve again with Selenium Manager even if the paths are cached.
+    :return: Tuple of (entry with 'driver_path' and 'browser_path', whether it came from the cache).
+    """
+    entry = None if refresh else _cache.get(browser)
+    if entry is not None:
+        return entry, True
+    service_class = BROWSERS[browser][0]
+    finder = DriverFinder(service_class(), options)
+    entry = {"driver_path": finder.get_driver_path(), "browser_path": finder.get_browser_path()}
+    _cache.put(browser, entry["driver_path"], entry["browser_path"])
+    return entry, False
+
+
+def start_session(browser, options):
+    """
+    Start a browser session with cached binary paths and time its start-up phases.
+
+    :param browser: Either 'chrome' or 'firefox'.
+    :param options: Browser options for the session.
+    :return: Tuple of (WebDriver instance, {'resolution', 'process_launch', 'session_creation'} in seconds).
+    """
+    if browser not in BROWSERS:
+        raise ValueError(f"Unsupported browser: {browser}")
+    service_class, driver_class = BROWSERS[browser]
+    for attempt in range(2):
+        started = time.perf_counter()
+        entry, cached = resolve(browser, options, refresh=attempt > 0)
+        timings = {"resolution": time.perf_counter() - started, "process_launch": 0.0}
+
+        service = service_class(executable_path=entry["driver_path"])
+        if entry["browser_path"]:
+            options.binary_location = entry["browser_path"]
+
+        # The driver class starts the service itself; time that call separately from the session request
+        start_service = service.start
+
+        def timed_start():
+            launch_started = time.perf_counter()
+            start_service()
+            timings["process_launch"] = time.perf_counter() - launch_started
+
+        service.start = timed_start
+        session_started = time.perf_counter()
+        try:
+            driver = driver_class(options=options, service=service)
+        except WebDriverException:
+            if cached and attempt == 0:
+                _cache.invalidate(browser)  # Stale paths, e.g. after a browser update: resolve again
+                continue
+            raise
+        timings["session_creation"] = time.perf_counter() - session_started - timings["process_launch"]
+        return driver, timings
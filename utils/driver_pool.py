@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.common.exceptions import WebDriverException
+
+from utils import driver_bootstrap, page_performance
+from utils.browser_profiles import PROFILES
+
+# Start-up phases timed for every launched session (see utils.driver_bootstrap)
+BOOTSTRAP_PHASES = ("resolution", "process_launch", "session_creation", "setup")
+
+
+def create_driver(browser, profile=None):
+    """
+    Launch a new browser session for the given browser name.
+
+    :param browser: Either 'chrome' or 'firefox'.
+    :param profile: BrowserProfile to launch with (defaults to the 'default' profile).
+    :return: WebDriver instance; headed sessions are maximized. Its start-up phase timings
+             (in seconds) are available as driver.bootstrap_timings.
+    """
+    profile = profile or PROFILES["default"]
+    if browser == "chrome":
+        chrome_options = ChromeOptions()
+        chrome_options.add_argument("--disable-notifications")
+        profile.apply_to_chrome_options(chrome_options)
+        driver, timings = driver_bootstrap.start_session("chrome", chrome_options)
+    elif browser == "firefox":
+        firefox_options = FirefoxOptions()
+        firefox_options.set_preference("dom.webnotifications.enabled", False)
+        profile.apply_to_firefox_options(firefox_options)
+        driver, timings = driver_bootstrap.start_session("firefox", firefox_options)
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+
+    started = time.perf_counter()
+    profile.apply_to_session(driver)
+    page_performance.enlarge_resource_buffer(driver)
+    if not profile.headless:
+        driver.maximize_window()
+    timings["setup"] = time.perf_counter() - started
+    driver.browser_profile = profile.name
+    driver.bootstrap_timings = timings
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps browser sessions alive across tests and hands them out again after a state reset.
+
+    One pool is meant to live for a pytest session (and therefore for one xdist worker).
+    Sessions that fail the health check or the reset are quit and replaced on the next acquire.
+    Sessions can be pre-warmed: launched in the background ahead of demand (e.g. during test
+    collection) and handed to the first acquire as soon as they are ready.
+    """
+
+    def __init__(self, factory=create_driver):
+        self.factory = factory
+        self._idle = defaultdict(list)
+        self._in_use = {}
+        self._warming = defaultdict(list)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prewarmed = 0
+        self.replaced = 0
+        self.launch_times = []
+        self.bootstrap_totals = dict.fromkeys(BOOTSTRAP_PHASES, 0.0)
+
+    def acquire(self, browser):
+        """
+        Return a ready session for the browser, reusing an idle one when it is still healthy.
+
+        :param browser: Browser name passed to the factory.
+        :return: WebDriver instance.
+        """
+        while True:
+            with self._lock:
+                driver = self._idle[browser].pop() if self._idle[browser] else None
+            if driver is None:
+                break
+            if self._is_healthy(driver):
+                self.hits += 1
+                self._in_use[id(driver)] = browser
+                return driver
+            self._discard(driver)
+
+        # Hand out a session that is being pre-warmed, waiting for it to finish starting if needed
+        with self._lock:
+            future = self._warming[browser].pop(0) if self._warming[browser] else None
+        if future is not None:
+            try:
+                driver = future.result()
+            except WebDriverException:
+                pass  # Launch in the foreground below, which reports the error if it persists
+            else:
+                self.prewarmed += 1
+                self._in_use[id(driver)] = browser
+                return driver
+
+        self.misses += 1
+        driver = self._launch(browser)
+        self._in_use[id(driver)] = browser
+        return driver
+
+    def prewarm(self, browser):
+        """
+        Start launching a session for the browser in the background; the next acquire takes it over.
+
+        :param browser: Browser name passed to the factory.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="driver-prewarm")
+            self._warming[browser].append(self._executor.submit(self._launch, browser))
+
+    def cancel_prewarm(self, keep=()):
+        """
+        Quit the pre-warmed sessions of browsers that are not needed after all (e.g. deselected by -k).
+
+        :param keep: Browser names whose pre-warmed sessions are kept.
+        """
+        with self._lock:
+            cancelled = [future for browser in list(self._warming) if browser not in keep
+                         for future in self._warming.pop(browser)]
+        for future in cancelled:
+            future.add_done_callback(self._quit_launched)
+
+    def _launch(self, browser):
+        started = time.perf_counter()
+        driver = self.factory(browser)
+        with self._lock:
+            self.launch_times.append(time.perf_counter() - started)
+            for phase, seconds in getattr(driver, "bootstrap_timings", {}).items():
+                if phase in self.bootstrap_totals:
+                    self.bootstrap_totals[phase] += seconds
+        return driver
+
+    @staticmethod
+    def _quit_launched(future):
+        if future.exception() is None:
+            try:
+                future.result().quit()
+            except Exception:
+                pass
+
+    def release(self, driver):
+        """
+        Reset the session state and return it to the pool, or discard it if the reset fails.
+
+        :param driver: WebDriver instance previously returned by acquire.
+        """
+        browser = self._in_use.pop(id(driver))
+        try:
+            self.reset(driver)
+        except Exception:  # A dead driver process raises urllib3 errors rather than WebDriverException
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle[browser].append(driver)
+
+    @staticmethod
+    def reset(driver):
+        """
+        Clear cookies, local/session storage and extra tabs so the next test starts from a blank session.
+        """
+        handles = driver.window_handles
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.delete_all_cookies()
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Chrome can also drop cookies of domains that are no longer open in any tab
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return bool(driver.window_handles)
+        except Exception:  # Crashed browser (WebDriverException) or dead driver process (e.g. MaxRetryError)
+            return False
+
+    def _discard(self, driver):
+        self.replaced += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every idle session in the pool, including pre-warmed sessions that were never used."""
+        self.cancel_prewarm()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            self._idle.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def stats(self):
+        """Return pool hit/miss counters, launch time statistics and total time per start-up phase."""
+        total_launch = sum(self.launch_times)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "prewarmed": self.prewarmed,
+            "replaced": self.replaced,
+            "launches": len(self.launch_times),
+            "total_launch_time": round(total_launch, 3),
+            "mean_launch_time": round(total_launch / len(self.launch_times), 3) if self.launch_times else 0.0,
+            "bootstrap": {phase: round(seconds, 3) for phase, seconds in self.bootstrap_totals.items()},
+        }
+
+
+def merge_pool_stats(stats_list):
+    """
+    Combine the statistics of several pools (e.g. one per xdist worker) into a single summary.
+
+    :param stats_list: List of dictionaries returned by DriverPool.stats.
+    :return: Dictionary in the same format as DriverPool.stats.
+    """
+    merged = {key: sum(stats[key] for stats in stats_list)
+              for key in ("hits", "misses", "prewarmed", "replaced", "launches", "total_launch_time")}
+    merged["total_launch_time"] = round(merged["total_launch_time"], 3)
+    merged["bootstrap"] = {phase: round(sum(stats["bootstrap"][phase] for stats in stats_list), 3)
+                           for phase in BOOTSTRAP_PHASES}
+    merged["mean_launch_time"] = (round(merged["total_launch_time"] / merged["launches"], 3)
+                                  if merged["launches"] else 0.0)
+    return merged
@@ -0,0 +1,204 @@
+"""
+Page performance metrics from the Navigation Timing, Resource Timing and Paint Timing APIs.
+
+After a page load, a single script call reads the navigation entry, the resource entries and the
+paint entries of the document. The metrics are checked against the budget declared by the page
+object, and every sample is recorded per page. At the end of the run, the median of every metric
+is appended to a local trend file, so pages that get slower show up across runs.
+
+Cross-origin resources report a transfer size of 0 unless their server sends Timing-Allow-Origin,
+so transfer_bytes is a lower bound on sites that load third-party assets.
+
+Browsers keep 250 resource entries per document by default. In Chrome the buffer is enlarged in every
+new document of the session (see enlarge_resource_buffer). A sample whose buffer was full is flagged as
+resources_truncated: its request_count and transfer_bytes are lower bounds and are left out of the medians.
+"""
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import WebDriverException
+
+DEFAULT_HISTORY_FILE = ".performance_history.json"
+
+# Runs kept in the trend file
+MAX_RUNS = 100
+
+# Metrics checked by budgets, with their unit in reports
+METRICS = {
+    "ttfb_ms": "ms",
+    "dom_content_loaded_ms": "ms",
+    "load_ms": "ms",
+    "first_paint_ms": "ms",
+    "first_contentful_paint_ms": "ms",
+    "transfer_bytes": "bytes",
+    "request_count": "requests",
+}
+
+# Metrics counted from the resource entries, which the resource timing buffer can truncate
+RESOURCE_METRICS = ("transfer_bytes", "request_count")
+
+# Resource entries kept per document in Chrome (the browser default is 250)
+RESOURCE_BUFFER_SIZE = 5000
+
+# Evaluated in every new document before the page's own scripts; the size is kept for PAGE_METRICS_SCRIPT
+ENLARGE_RESOURCE_BUFFER_SCRIPT = f"""
+performance.setResourceTimingBufferSize({RESOURCE_BUFFER_SIZE});
+window.__resourceTimingBufferSize = {RESOURCE_BUFFER_SIZE};
+"""
+
+# Returns the metrics of the current document. Timings are milliseconds since the start of the
+# navigation; a timing is null when its event has not happened yet (e.g. with the eager load strategy).
+PAGE_METRICS_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const paints = Object.fromEntries(performance.getEntriesByType('paint').map(e => [e.name, e.startTime]));
+const since = value => (navigation && value > 0 ? Math.round(value) : null);
+return {
+    url: document.URL,
+    ttfb_ms: navigation ? since(navigation.responseStart) : null,
+    dom_content_loaded_ms: navigation ? since(navigation.domContentLoadedEventEnd) : null,
+    load_ms: navigation ? since(navigation.loadEventEnd) : null,
+    first_paint_ms: paints['first-paint'] !== undefined ? Math.round(paints['first-paint']) : null,
+    first_contentful_paint_ms:
+        paints['first-contentful-paint'] !== undefined ? Math.round(paints['first-contentful-paint']) : null,
+    transfer_bytes: (navigation ? navigation.transferSize : 0)
+        + resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    request_count: (navigation ? 1 : 0) + resources.length,
+    resources_truncated: resources.length >= (window.__resourceTimingBufferSize || 250)
+};
+"""
+
+
+def enlarge_resource_buffer(driver):
+    """
+    Enlarge the resource timing buffer of every document loaded later in the current tab (Chrome only,
+    through CDP). Like other CDP settings it only covers one tab, so it is applied to every new tab.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ENLARGE_RESOURCE_BUFFER_SCRIPT})
+
+
+def collect(driver):
+    """
+    Read the performance metrics of the current document in one script call.
+
+    :return: Dictionary of metrics (see METRICS) plus the document URL, or None if the script failed.
+    """
+    try:
+        return driver.execute_script(PAGE_METRICS_SCRIPT)
+    except WebDriverException:
+        return None
+
+
+def check_budget(metrics, budget):
+    """
+    Compare metrics with a budget.
+
+    :param metrics: Result of collect().
+    :param budget: {metric name: maximum value}; metrics that were not measured are skipped.
+    :return: List of violations with 'metric', 'value', 'budget' and 'unit' keys.
+    """
+    violations = []
+    for metric, limit in (budget or {}).items():
+        value = metrics.get(metric)
+        if value is not None and value > limit:
+            violations.append({"metric": metric, "value": value, "budget": limit, "unit": METRICS.get(metric, "")})
+    return violations
+
+
+class PerformanceRecorder:
+    """Collects performance samples and budget violations per page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.violations = []
+        self.enabled = True
+
+    def record(self, page, metrics, violations, test=None):
+        with self._lock:
+            self.samples[page].append(metrics)
+            self.violations.extend(dict(violation, page=page, url=metrics.get("url"), test=test)
+                                   for violation in violations)
+
+    def to_dict(self):
+        with self._lock:
+            return {"samples": {page: list(samples) for page, samples in self.samples.items()},
+                    "violations": list(self.violations)}
+
+
+recorder = PerformanceRecorder()
+
+
+def merge_results(results):
+    """Merge several PerformanceRecorder.to_dict results (e.g. one per xdist worker)."""
+    merged = {"samples": defaultdict(list), "violations": []}
+    for result in results:
+        for page, samples in result.get("samples", {}).items():
+            merged["samples"][page].extend(samples)
+        merged["violations"].extend(result.get("violations", []))
+    return merged
+
+
+def summarize(samples):
+    """
+    :param samples: {page: [metrics, ...]}.
+    :return: {page: {metric: median}} over the samples in which the metric was measured; resource metrics
+             of samples with a truncated resource timing buffer are left out.
+    """
+    summary = {}
+    for page, page_samples in samples.items():
+        summary[page] = {}
+        for metric in METRICS:
+            values = [sample[metric] for sample in page_samples if sample.get(metric) is not None
+                      and not (metric in RESOURCE_METRICS and sample.get("resources_truncated"))]
+            if values:
+                summary[page][metric] = statistics.median(values)
+    return summary
+
+
+def load_history(path=DEFAULT_HISTORY_FILE):
+    """Return the runs stored in the trend file (oldest first)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_run(results, path=DEFAULT_HISTORY_FILE):
+    """
+    Append the medians, violation count and number of samples with truncated resource timing
+    of this run to the trend file.
+
+    :param results: Result of merge_results() for the whole run.
+    :return: The stored run entry, or None when no page was measured.
+    """
+    if not results["samples"]:
+        return None
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pages": summarize(results["samples"]),
+        "violations": len(results["violations"]),
+        "truncated_samples": sum(1 for samples in results["samples"].values()
+                                 for sample in samples if sample.get("resources_truncated")),
+    }
+    runs = (load_history(path) + [run])[-MAX_RUNS:]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(runs, file, indent=2)
+    return run
+
+
+def format_trend(page, metric, value, previous):
+    """Describe a median against the previous run, e.g. 'load_ms: 1840 (+12.5% vs previous run)'."""
+    unit = METRICS.get(metric, "")
+    line = f"{page} {metric}: {value:g} {unit}"
+    if previous:
+        line += f" ({(value - previous) / previous:+.1%} vs previous run)"
+    return line
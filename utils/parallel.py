@@ -0,0 +1,51 @@
+import os
+import shutil
+
+WORKER_ENV = "PYTEST_XDIST_WORKER"
+
+
+def get_worker_id():
+    """Return the pytest-xdist worker id (e.g. 'gw0'), or 'master' when tests run in a single process."""
+    return os.environ.get(WORKER_ENV, "master")
+
+
+def is_worker():
+    """Return True when running inside a pytest-xdist worker process."""
+    return WORKER_ENV in os.environ
+
+
+def worker_namespace(root):
+    """
+    Return the artifact directory of the current process.
+
+    Workers get an isolated subdirectory of `root` so concurrent writes never collide;
+    a single-process run writes to `root` directly.
+
+    :param root: Shared artifact root directory (e.g. 'Screenshots' or 'allure-results').
+    :return: Directory path for the current process.
+    """
+    return os.path.join(root, get_worker_id()) if is_worker() else root
+
+
+def merge_worker_dirs(root):
+    """
+    Move the files written by each worker under `root/<worker_id>` back into `root`.
+
+    Allure result files are named by UUID, so merging them into one directory is collision-free.
+
+    :param root: Artifact root that contains the worker subdirectories.
+    :return: Number of files merged.
+    """
+    if not os.path.isdir(root):
+        return 0
+
+    merged = 0
+    for entry in os.listdir(root):
+        worker_dir = os.path.join(root, entry)
+        if not (entry.startswith("gw") and os.path.isdir(worker_dir)):
+            continue
+        for filename in os.listdir(worker_dir):
+            shutil.move(os.path.join(worker_dir, filename), os.path.join(root, filename))
+            merged += 1
+        os.rmdir(worker_dir)
+    return merged
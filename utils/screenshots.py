@@ -0,0 +1,162 @@
+import hashlib
+import io
+import os
+import queue
+import threading
+from collections import deque
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional: without it screenshots are stored as captured
+    Image = None
+
+# Default per-run disk budget for stored screenshots
+DEFAULT_DISK_BUDGET_MB = 500
+
+_pipeline = None
+
+
+class ScreenshotPipeline:
+    """
+    Stores screenshots off the test thread.
+
+    Captures are deduplicated by content hash on the calling thread (cheap), while optional
+    downscaling/recompression and the disk write happen on a background worker. Once the files
+    written during the run exceed the disk budget, the oldest ones are evicted.
+    """
+
+    def __init__(self, disk_budget_mb=DEFAULT_DISK_BUDGET_MB, max_width=None):
+        """
+        :param disk_budget_mb: Maximum size (in MB) of the screenshots kept from this run.
+        :param max_width: Optional width (in pixels) to downscale screenshots to before storing (needs Pillow).
+        """
+        self.disk_budget = int(disk_budget_mb * 1024 * 1024)
+        self.max_width = max_width
+        self.captured = 0
+        self.duplicates = 0
+        self.evicted = 0
+        self.errors = []
+        self._seen = {}
+        self._stored = deque()
+        self._stored_bytes = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, png, filename):
+        """
+        Queue a PNG capture to be stored under `filename`.
+
+        :param png: PNG bytes returned by the driver.
+        :param filename: Destination path.
+        :return: Path of an earlier identical capture when this one is a duplicate, otherwise None.
+        """
+        digest = hashlib.sha1(png).hexdigest()
+        with self._lock:
+            self.captured += 1
+            original = self._seen.get(digest)
+            if original:
+                self.duplicates += 1
+                return original
+            self._seen[digest] = filename
+        self._queue.put((png, filename))
+        return None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._store(*item)
+            except Exception as e:  # Keep the worker alive, or flush() would wait forever
+                self.errors.append(f"{item[1]}: {type(e).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _store(self, png, filename):
+        data = self._compress(png)
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, "wb") as file:
+            file.write(data)
+
+        self._stored.append((filename, len(data)))
+        self._stored_bytes += len(data)
+        while self._stored_bytes > self.disk_budget and len(self._stored) > 1:
+            old_filename, size = self._stored.popleft()
+            self._stored_bytes -= size
+            self.evicted += 1
+            if os.path.exists(old_filename):
+                os.remove(old_filename)
+
+    def _compress(self, png):
+        """Downscale to `max_width` and re-encode with maximum PNG compression when Pillow is available."""
+        if Image is None:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue() if output.tell() < len(png) else png
+
+    def flush(self):
+        """Block until every queued screenshot has been stored."""
+        self._queue.join()
+
+    def close(self):
+        """Store the remaining screenshots and stop the worker thread."""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """Return capture, deduplication and eviction counters and the errors of screenshots that were not stored."""
+        return {
+            "captured": self.captured,
+            "duplicates": self.duplicates,
+            "evicted": self.evicted,
+            "stored_bytes": self._stored_bytes,
+            "errors": list(self.errors),
+        }
+
+
+def configure(disk_budget_mb=DEFAULT_DISK_BUDGET_MB, max_width=None):
+    """Create the process-wide screenshot pipeline with the given settings."""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.close()
+    _pipeline = ScreenshotPipeline(disk_budget_mb, max_width)
+    return _pipeline
+
+
+def get_pipeline():
+    """Return the process-wide screenshot pipeline, creating it with default settings if needed."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ScreenshotPipeline()
+    return _pipeline
+
+
+def shutdown():
+    """
+    Store pending screenshots and stop the process-wide pipeline.
+
+    :return: Final stats() of the pipeline, or None if it was never created.
+    """
+    global _pipeline
+    if _pipeline is None:
+        return None
+    _pipeline.close()
+    stats, _pipeline = _pipeline.stats(), None
+    return stats
+
+
+def merge_stats(stats_list):
+    """Combine the stats() of several pipelines (e.g. one per xdist worker) into a single summary."""
+    merged = {key: sum(stats[key] for stats in stats_list)
+              for key in ("captured", "duplicates", "evicted", "stored_bytes")}
+    merged["errors"] = [error for stats in stats_list for error in stats["errors"]]
+    return merged
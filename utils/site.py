@@ -0,0 +1,23 @@
+import os
+
+# Origins hard-coded in the page objects
+LIVE_SITE_URL = "https://useinsider.com"
+LIVE_LEVER_URL = "https://jobs.lever.co"
+
+# Environment variables that redirect the page objects to another deployment (e.g. the local replica)
+SITE_URL_ENV = "INSIDER_BASE_URL"
+LEVER_URL_ENV = "LEVER_BASE_URL"
+
+
+def resolve_url(url):
+    """
+    Rewrite a live Insider or Lever URL to the configured base URL, if one is set.
+
+    :param url: URL as declared in a page object, e.g. 'https://useinsider.com/careers/'.
+    :return: The URL on the configured deployment, or `url` unchanged.
+    """
+    for live_url, env in ((LIVE_SITE_URL, SITE_URL_ENV), (LIVE_LEVER_URL, LEVER_URL_ENV)):
+        base_url = os.environ.get(env)
+        if base_url and url.startswith(live_url):
+            return base_url.rstrip("/") + url[len(live_url):]
+    return url
@@ -0,0 +1,228 @@
+"""
+Step-graph scheduler that runs independent branches of a test in separate tabs of one browser session.
+
+Steps declare the steps they depend on and the tab they run in (by default the tab of their first
+dependency). Steps of one tab run one after another; steps of different tabs are interleaved. A step
+can split a non-blocking `start` (such as BasePage.start_enter) and a `ready` condition off its
+blocking body: the scheduler kicks off the start of every tab first and runs the bodies of whichever
+tabs are ready, so page loads in one tab overlap with the work done in the others.
+
+WebDriver executes one command at a time per session, so only waiting overlaps, never commands.
+Errors are collected per step, like the `errors` list of a sequential test, and do not stop the graph;
+the steps that depend on a failed step are skipped instead of failing in turn.
+"""
+import time
+
+import allure
+
+from utils import page_performance, timing, waits
+from utils.browser_profiles import block_resources_in_window
+from utils.attachments import attach
+
+MAIN_TAB = "main"
+DEFAULT_STEP_TIMEOUT = 30
+
+
+class Step:
+    """
+    A node of the step graph.
+
+    :param name: Unique name, also used as the title of the step's Allure step.
+    :param run: Blocking body of the step, called without arguments once the step is ready.
+    :param depends_on: Names of the steps that must finish before this one starts.
+    :param tab: Name of the tab the step runs in.
+    :param start: Non-blocking call that begins the step, such as starting a page load.
+    :param ready: Condition, called without arguments, that tells whether the started step can run its body.
+    :param timeout: Maximum time (in seconds) between the start and the step becoming ready.
+    """
+
+    def __init__(self, name, run=None, depends_on=(), tab=MAIN_TAB, start=None, ready=None,
+                 timeout=DEFAULT_STEP_TIMEOUT):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.tab = tab
+        self.start = start
+        self.ready = ready
+        self.timeout = timeout
+        self.state = "waiting"  # waiting -> started -> done, or waiting -> skipped
+        self.error = None
+        self.skip_reason = None
+        self.started_at = None
+        self.wait_time = 0.0
+        self.run_time = 0.0
+
+
+class StepGraph:
+    """
+    Runs a graph of steps across the tabs of one WebDriver session.
+
+    :param driver: WebDriver instance; its current tab becomes the main tab.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.steps = {}
+        self.errors = []
+        self._handles = {}
+        self._current_tab = None
+
+    def add(self, name, run=None, depends_on=(), tab=None, start=None, ready=None, timeout=DEFAULT_STEP_TIMEOUT):
+        """
+        Add a step. Dependencies must be added before the steps that depend on them, which keeps the graph acyclic.
+
+        :param tab: Tab of the step; defaults to the tab of its first dependency, or the main tab.
+        :return: The new Step (see Step for the other parameters).
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        unknown = [dependency for dependency in depends_on if dependency not in self.steps]
+        if unknown:
+            raise ValueError(f"Step '{name}' depends on unknown steps: {', '.join(unknown)}")
+        if tab is None:
+            tab = self.steps[depends_on[0]].tab if depends_on else MAIN_TAB
+        step = Step(name, run, depends_on, tab, start, ready, timeout)
+        self.steps[name] = step
+        return step
+
+    def run(self):
+        """
+        Run every step of the graph and attach a per-step summary to the report.
+
+        :return: Error messages of the failed steps, in the order they failed.
+        """
+        self._handles[MAIN_TAB] = self.driver.current_window_handle
+        self._current_tab = MAIN_TAB
+        pending = list(self.steps.values())
+        interval = waits.POLL_START
+        while pending:
+            progressed = self._skip_blocked(pending)
+            heads = self._heads(pending)
+
+            # Kick off every tab first, so that their page loads overlap with the bodies run below
+            for step in heads:
+                if step.state == "waiting" and step.start is not None:
+                    self._start(step)
+                    progressed = True
+
+            for step in heads:
+                if step.state == "done" or self._is_ready(step):
+                    if step.state != "done":
+                        self._run(step)
+                    pending.remove(step)
+                    progressed = True
+                    break  # Re-evaluate, as the finished step may unblock the start of another tab
+
+            if progressed:
+                interval = waits.POLL_START
+            else:
+                time.sleep(interval)
+                timing.record_wait(interval)
+                interval = min(interval * waits.POLL_FACTOR, waits.POLL_MAX)
+
+        attach(self.summary(), name="Step Graph", attachment_type=allure.attachment_type.TEXT)
+        return self.errors
+
+    def summary(self):
+        """
+        :return: One line per step with its tab, time spent waiting to become ready, run time and outcome.
+        """
+        lines = []
+        for step in self.steps.values():
+            if step.state == "skipped":
+                lines.append(f"{step.name} [tab: {step.tab}] - skipped: {step.skip_reason}")
+                continue
+            outcome = f"FAILED: {step.error}" if step.error else "ok"
+            lines.append(f"{step.name} [tab: {step.tab}] waited {step.wait_time:.2f}s, "
+                         f"ran {step.run_time:.2f}s - {outcome}")
+        return "\n".join(lines)
+
+    def _skip_blocked(self, pending):
+        """
+        Skip the pending steps that depend on a failed or skipped step, so that one failure does not
+        cascade into errors of the steps that build on it.
+
+        :return: True if any step was skipped.
+        """
+        skipped = False
+        for step in list(pending):  # Dependencies come first, so a skip reaches their dependents in the same pass
+            for dependency in map(self.steps.get, step.depends_on):
+                if dependency.error or dependency.state == "skipped":
+                    step.state = "skipped"
+                    step.skip_reason = dependency.skip_reason or f"dependency '{dependency.name}' failed"
+                    pending.remove(step)
+                    skipped = True
+                    break
+        return skipped
+
+    def _heads(self, pending):
+        """Return the first pending step of every tab whose dependencies have all finished."""
+        heads = {}
+        for step in pending:
+            if step.tab not in heads:
+                heads[step.tab] = step
+        return [step for step in heads.values()
+                if all(self.steps[dependency].state == "done" for dependency in step.depends_on)]
+
+    def _switch_to(self, tab):
+        """Make a tab current, opening it on first use."""
+        if tab == self._current_tab:
+            return
+        if tab in self._handles:
+            self.driver.switch_to.window(self._handles[tab])
+        else:
+            self.driver.switch_to.new_window("tab")
+            block_resources_in_window(self.driver)
+            page_performance.enlarge_resource_buffer(self.driver)
+            self._handles[tab] = self.driver.current_window_handle
+        self._current_tab = tab
+
+    def _start(self, step):
+        self._switch_to(step.tab)
+        step.started_at = time.perf_counter()
+        step.state = "started"
+        try:
+            step.start()
+        except Exception as e:
+            self._fail(step, e)
+
+    def _is_ready(self, step):
+        """Check the ready condition of a step in its tab, failing the step once its timeout has passed."""
+        if step.ready is None:
+            return True
+        self._switch_to(step.tab)
+        if step.started_at is None:
+            step.started_at = time.perf_counter()
+            step.state = "started"
+        elapsed = time.perf_counter() - step.started_at
+        try:
+            if step.ready():
+                step.wait_time = elapsed
+                return True
+        except Exception as e:
+            self._fail(step, e)
+            return True
+        if elapsed > step.timeout:
+            self._fail(step, TimeoutError(f"not ready after {step.timeout}s"))
+            return True
+        return False
+
+    def _run(self, step):
+        self._switch_to(step.tab)
+        started = time.perf_counter()
+        try:
+            if step.run is not None:
+                with allure.step(step.name):
+                    step.run()
+        except Exception as e:
+            self._fail(step, e)
+        finally:
+            step.run_time = time.perf_counter() - started
+            step.state = "done"
+            # The body may have moved on to another window, such as a newly opened posting tab
+            self._handles[step.tab] = self.driver.current_window_handle
+
+    def _fail(self, step, error):
+        step.state = "done"
+        step.error = str(error)
+        self.errors.append(f"{step.name}: {step.error}")
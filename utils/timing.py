@@ -0,0 +1,227 @@
+"""
+Per-step timing and WebDriver command instrumentation.
+
+For every allure step of a test this records the wall time, the number of WebDriver commands,
+the time spent in explicit sleeps and the time spent waiting in BasePage.wait_for_element.
+Runs can be saved as JSON and compared against a stored baseline:
+
+    python -m utils.timing compare timings.json baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+import allure_commons
+
+TEST_STEP = "<test>"
+
+_instrumentation = None
+
+
+class StepMetrics:
+    def __init__(self, uuid, title, path):
+        self.uuid = uuid
+        self.title = title
+        self.path = path
+        self.started = time.perf_counter()
+        self.commands = 0
+        self.sleep_time = 0.0
+        self.wait_time = 0.0
+
+    def to_dict(self):
+        return {
+            "step": self.title,
+            "path": self.path,
+            "wall_time": round(time.perf_counter() - self.started, 4),
+            "commands": self.commands,
+            "sleep_time": round(self.sleep_time, 4),
+            "wait_time": round(self.wait_time, 4),
+        }
+
+
+class Instrumentation:
+    """
+    Collects step metrics through the allure step hooks.
+
+    Metrics are added to every open step, so a parent step includes the commands, sleeps and
+    waits of its nested steps. The '<test>' entry covers the whole test body.
+    """
+
+    def __init__(self):
+        self.tests = {}
+        self._test = None
+        self._stack = []
+        self._paths = {}
+
+    def begin_test(self, nodeid):
+        self._test = nodeid
+        self._paths = {}
+        self._stack = [StepMetrics(None, TEST_STEP, TEST_STEP)]
+        self.tests[nodeid] = []
+
+    def end_test(self):
+        while self._stack:
+            self._finish(self._stack.pop())
+        self._test = None
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title):
+        if self._test is None:
+            return
+        parent_path = self._stack[-1].path if len(self._stack) > 1 else ""
+        path = f"{parent_path} > {title}" if parent_path else title
+
+        # Repeated steps with the same path get a numeric suffix so they can be matched across runs
+        count = self._paths.get(path, 0) + 1
+        self._paths[path] = count
+        if count > 1:
+            path = f"{path} #{count}"
+        self._stack.append(StepMetrics(uuid, title, path))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid):
+        while len(self._stack) > 1:
+            step = self._stack.pop()
+            self._finish(step)
+            if step.uuid == uuid:
+                break
+
+    def _finish(self, step):
+        self.tests[self._test].append(step.to_dict())
+
+    def record_command(self):
+        for step in self._stack:
+            step.commands += 1
+
+    def record_sleep(self, seconds):
+        for step in self._stack:
+            step.sleep_time += seconds
+
+    def record_wait(self, seconds):
+        for step in self._stack:
+            step.wait_time += seconds
+
+
+def install():
+    """Create the process-wide instrumentation and register it for allure step events."""
+    global _instrumentation
+    if _instrumentation is None:
+        _instrumentation = Instrumentation()
+        allure_commons.plugin_manager.register(_instrumentation)
+    return _instrumentation
+
+
+def uninstall():
+    global _instrumentation
+    if _instrumentation is not None:
+        allure_commons.plugin_manager.unregister(_instrumentation)
+        _instrumentation = None
+
+
+def instrument_driver(driver):
+    """
+    Count every WebDriver command issued through the driver (including WebElement commands).
+
+    :param driver: WebDriver instance; wrapping is applied only once per instance.
+    :return: The same driver.
+    """
+    if getattr(driver, "_timing_instrumented", False):
+        return driver
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        if _instrumentation is not None:
+            _instrumentation.record_command()
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    driver._timing_instrumented = True
+    return driver
+
+
+def sleep(seconds):
+    """time.sleep that is accounted to the running steps."""
+    time.sleep(seconds)
+    if _instrumentation is not None:
+        _instrumentation.record_sleep(seconds)
+
+
+def record_wait(seconds):
+    """Account time spent waiting for a condition to the running steps."""
+    if _instrumentation is not None:
+        _instrumentation.record_wait(seconds)
+
+
+def to_report(tests):
+    """Build the JSON document written for a run."""
+    return {"created": datetime.now().isoformat(timespec="seconds"), "tests": tests}
+
+
+def save_report(tests, path):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(to_report(tests), file, indent=2)
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(current, baseline, threshold=0.2, min_delta=0.1):
+    """
+    Find steps whose wall time or command count regressed against a baseline run.
+
+    :param current: Report of the run to check (as returned by to_report/load_report).
+    :param baseline: Report of the reference run.
+    :param threshold: Relative increase (0.2 = 20%) above which a metric counts as regressed.
+    :param min_delta: Minimum absolute wall time increase (in seconds) to report, to ignore jitter.
+    :return: List of regression dictionaries (test, step, metric, baseline, current, change).
+    """
+    regressions = []
+    for nodeid, steps in current["tests"].items():
+        baseline_steps = {step["path"]: step for step in baseline["tests"].get(nodeid, [])}
+        for step in steps:
+            reference = baseline_steps.get(step["path"])
+            if reference is None:
+                continue
+            for metric, minimum in (("wall_time", min_delta), ("commands", 1)):
+                before, after = reference[metric], step[metric]
+                if after - before >= minimum and after > before * (1 + threshold):
+                    regressions.append({
+                        "test": nodeid,
+                        "step": step["path"],
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": round((after - before) / before, 3) if before else None,
+                    })
+    return regressions
+
+
+def format_regression(regression):
+    change = f"{regression['change']:+.0%}" if regression["change"] is not None else "new"
+    return (f"{regression['test']} :: {regression['step']}: {regression['metric']} "
+            f"{regression['baseline']} -> {regression['current']} ({change})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subparsers.add_parser("compare", help="diff a timing report against a baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    compare_parser.add_argument("--min-delta", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    regressions = compare(load_report(args.current), load_report(args.baseline), args.threshold, args.min_delta)
+    for regression in regressions:
+        print(format_regression(regression))
+    print(f"{len(regressions)} regression(s) found")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
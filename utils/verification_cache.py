@@ -0,0 +1,117 @@
+"""
+Local cache of verification results keyed on DOM content fingerprints, for incremental runs.
+
+Page objects compute a cheap fingerprint of the DOM they verify (block headers, job card fields)
+in the page itself, so only a short hash crosses the wire. After a passing verification the
+fingerprint is stored. In incremental mode, a later run whose fingerprint matches the last passing
+one skips the expensive part of the verification (screenshots, per-field assertions, the Lever
+hover-and-click) and reports what it skipped. A failing verification removes the entry, so the
+next run verifies in full again.
+"""
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_FILE = ".verification_cache.json"
+
+# JavaScript helper prepended to fingerprint scripts: fingerprint(text) returns a 64-bit hex digest
+# made of the 32-bit FNV-1a and djb2 hashes of the text.
+FINGERPRINT_FUNCTION = """
+function fingerprint(text) {
+    let fnv = 0x811c9dc5, djb = 5381;
+    for (let i = 0; i < text.length; i++) {
+        const code = text.charCodeAt(i);
+        fnv = Math.imul(fnv ^ code, 0x01000193) >>> 0;
+        djb = (Math.imul(djb, 33) + code) >>> 0;
+    }
+    return fnv.toString(16).padStart(8, '0') + djb.toString(16).padStart(8, '0');
+}
+"""
+
+_cache = None
+
+
+class VerificationCache:
+    """
+    Fingerprints and results of the last passing verifications, stored in a local JSON file.
+
+    :param path: JSON file with {key: {fingerprint, data, verified_at}}; None keeps the cache in memory.
+    :param incremental: When False, nothing is skipped (entries are still updated).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, incremental=False):
+        self.path = path
+        self.incremental = incremental
+        self.entries = {}
+        self.updates = {}
+        self.skipped = []
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.entries.update(json.load(file))
+
+    def lookup(self, key, fingerprint):
+        """
+        Return the data stored by the last passing verification, if incremental mode is on
+        and the fingerprint is unchanged since then; None means a full verification is needed.
+        """
+        if not self.incremental or fingerprint is None:
+            return None
+        with self._lock:
+            entry = self.updates[key] if key in self.updates else self.entries.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["data"]
+
+    def store(self, key, fingerprint, data=None):
+        """Remember a passing verification."""
+        if fingerprint is None:
+            return
+        with self._lock:
+            self.updates[key] = {"fingerprint": fingerprint, "data": data,
+                                 "verified_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    def invalidate(self, key):
+        """Forget a verification that failed, so the next run verifies in full."""
+        with self._lock:
+            self.updates[key] = None
+
+    def record_skip(self, key, skipped):
+        """Record what a verification skipped, for the run summary."""
+        with self._lock:
+            self.skipped.append({"key": key, "skipped": skipped})
+
+    def save(self, extra_updates=()):
+        """
+        Write the updates of this run (and of other processes, e.g. xdist workers) to the cache file.
+
+        :param extra_updates: Iterable of {key: entry or None} dictionaries.
+        """
+        merged = dict(self.entries)
+        for updates in [self.updates, *extra_updates]:
+            for key, entry in updates.items():
+                if entry is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = entry
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(merged, file, indent=2, sort_keys=True)
+
+
+def install(path=DEFAULT_CACHE_FILE, incremental=False):
+    """Load the verification cache used by the page objects for this process."""
+    global _cache
+    _cache = VerificationCache(path, incremental)
+    return _cache
+
+
+def get_cache():
+    """Return the installed cache; without one, a disabled in-memory cache is installed."""
+    global _cache
+    if _cache is None:
+        _cache = VerificationCache(path=None, incremental=False)
+    return _cache
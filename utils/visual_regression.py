@@ -0,0 +1,214 @@
+"""
+Visual regression of block screenshots against stored baselines, vectorized with NumPy.
+
+Each capture is compared with the baseline of the same block and browser in stages:
+
+1. a fast pre-check: captures identical to the baseline outside the masked regions (dynamic content
+   such as videos or counters) stop here, without a diff image;
+2. a perceptual check on 32x32 downscaled copies: the distance between their difference hashes
+   (rising and falling edges between horizontal and vertical neighbours) and their mean absolute
+   difference. Captures with a large distance, or a mean difference too large for the similarity
+   threshold to be met, fail here without a diff image. The check never passes a capture: changes
+   that average out within a block (shifted text, redrawn strokes) barely move the downscaled copies;
+3. every other capture gets a full-size per-pixel comparison that ignores differences below a small
+   tolerance (anti-aliasing) and the masked regions, and a diff image that fades the baseline, paints
+   changed pixels red and tints masked regions blue.
+
+The similarity score is the share of unmasked pixels that did not change. Captures failed by the
+perceptual check report the highest similarity their mean difference allows. Without a baseline,
+the capture becomes the baseline.
+"""
+import io
+import os
+import threading
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # NumPy and Pillow are optional: without them visual regression is unavailable
+    np = None
+    Image = None
+
+DEFAULT_BASELINE_DIR = "visual_baselines"
+DEFAULT_THRESHOLD = 0.99
+
+# Per-channel difference (0-255) below which a pixel counts as unchanged
+PIXEL_TOLERANCE = 16
+
+# Side of the downscaled copies used by the perceptual check
+PRECHECK_SIZE = 32
+
+# Grayscale difference (0-255) between neighbouring cells of a downscaled copy that counts as an edge
+EDGE_MARGIN = 4
+
+# Share of differing hash bits at or above which the perceptual check fails a capture as a layout change
+LAYOUT_HASH_DISTANCE = 0.2
+
+_store = None
+
+
+def is_available():
+    return np is not None and Image is not None
+
+
+def decode(png):
+    """Decode PNG bytes into an RGB array of shape (height, width, 3)."""
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def encode(pixels):
+    """Encode an RGB array as PNG bytes."""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def mask_array(shape, masks):
+    """
+    Build a boolean mask (True = ignored) from regions given as fractions of the image size.
+
+    :param shape: Shape of the image array.
+    :param masks: Iterable of (x, y, width, height) tuples with values between 0 and 1.
+    """
+    height, width = shape[:2]
+    masked = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in masks:
+        masked[int(y * height):int(round((y + h) * height)), int(x * width):int(round((x + w) * width))] = True
+    return masked
+
+
+def downscale(pixels, size=PRECHECK_SIZE):
+    """Downscale an image to size x size grayscale by averaging blocks of pixels."""
+    gray = pixels.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    height, width = gray.shape
+    rows = np.linspace(0, height, size + 1).astype(int)
+    cols = np.linspace(0, width, size + 1).astype(int)
+    # Sum over block boundaries with a summed-area table instead of looping over blocks
+    table = np.pad(gray.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+    sums = table[rows[1:, None], cols[None, 1:]] - table[rows[:-1, None], cols[None, 1:]] \
+        - table[rows[1:, None], cols[None, :-1]] + table[rows[:-1, None], cols[None, :-1]]
+    areas = np.maximum(np.diff(rows)[:, None] * np.diff(cols)[None, :], 1)
+    return sums / areas
+
+
+def difference_hash(small, margin=EDGE_MARGIN):
+    """
+    Difference hash of a downscaled grayscale image, as a boolean array.
+
+    Every pair of horizontal and vertical neighbours contributes two bits: the second cell is brighter,
+    or darker, by more than the margin. Flat regions therefore hash the same despite noise, and an edge
+    in either direction (e.g. a dark band on a light page) changes the hash.
+    """
+    horizontal = small[:, 1:] - small[:, :-1]
+    vertical = small[1:, :] - small[:-1, :]
+    return np.concatenate([(horizontal > margin).ravel(), (horizontal < -margin).ravel(),
+                           (vertical > margin).ravel(), (vertical < -margin).ravel()])
+
+
+def compare(baseline_png, capture_png, masks=(), tolerance=PIXEL_TOLERANCE, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a capture with its baseline.
+
+    :param baseline_png: PNG bytes of the baseline.
+    :param capture_png: PNG bytes of the new capture.
+    :param masks: Regions to ignore, as (x, y, width, height) fractions of the image size.
+    :param tolerance: Per-channel difference below which a pixel counts as unchanged.
+    :param threshold: Minimum similarity for a capture to pass, used to fail large differences early.
+    :return: Dictionary with 'stage' ('identical', 'layout' or 'pixels' - the stage that decided),
+             'similarity', 'hash_distance', 'hash_bits', 'mean_difference', 'changed_pixels' (None unless the
+             full-size comparison ran), 'size_changed', 'fast_path' and 'diff_png' (None unless the full-size
+             comparison ran).
+    """
+    baseline = decode(baseline_png)
+    capture = decode(capture_png)
+    size_changed = baseline.shape != capture.shape
+    if size_changed:
+        # Compare on the baseline's geometry; the size change itself is reported separately
+        capture = np.asarray(Image.fromarray(capture).resize((baseline.shape[1], baseline.shape[0])))
+    masked = mask_array(baseline.shape, masks)
+
+    # Masked pixels take the baseline's values, so they never count as changed
+    unmasked_capture = np.where(masked[..., None], baseline, capture)
+    considered = max(int((~masked).sum()), 1)
+    if not size_changed and np.array_equal(baseline, unmasked_capture):
+        return {"stage": "identical", "similarity": 1.0, "hash_distance": 0, "hash_bits": 0,
+                "mean_difference": 0.0, "changed_pixels": 0, "size_changed": False, "fast_path": True,
+                "diff_png": None}
+
+    # Perceptual check on downscaled copies: layout changes fail without a diff, nothing passes here
+    small_baseline, small_capture = downscale(baseline), downscale(unmasked_capture)
+    baseline_hash, capture_hash = difference_hash(small_baseline), difference_hash(small_capture)
+    hash_distance = int(np.count_nonzero(baseline_hash != capture_hash))
+    mean_difference = round(float(np.abs(small_baseline - small_capture).mean()), 3)
+    result = {"hash_distance": hash_distance, "hash_bits": baseline_hash.size, "mean_difference": mean_difference,
+              "changed_pixels": None, "size_changed": size_changed, "fast_path": True, "diff_png": None}
+
+    # An unchanged pixel differs by at most the tolerance, a changed one by at most 255, so the mean
+    # difference bounds the share of changed pixels from below (block averages never exceed it)
+    max_similarity = min(1.0, 1 - (mean_difference * masked.size / considered - tolerance) / (255 - tolerance))
+    if hash_distance >= LAYOUT_HASH_DISTANCE * baseline_hash.size or max_similarity < threshold:
+        return dict(result, stage="layout", similarity=round(max_similarity, 6))
+
+    changed = np.abs(baseline.astype(np.int16) - unmasked_capture.astype(np.int16)).max(axis=2) > tolerance
+    changed_pixels = int(np.count_nonzero(changed))
+
+    diff = (baseline.astype(np.float32) * 0.3 + 255 * 0.7).astype(np.uint8)  # Faded baseline
+    diff[masked] = (diff[masked] * 0.6 + np.array([0, 0, 255]) * 0.4).astype(np.uint8)
+    diff[changed] = (255, 0, 0)
+    return dict(result, stage="pixels", similarity=round(1 - changed_pixels / considered, 6),
+                changed_pixels=changed_pixels, fast_path=False, diff_png=encode(diff))
+
+
+class BaselineStore:
+    """
+    Baseline images stored as <baseline_dir>/<browser>/<name>.png.
+
+    :param baseline_dir: Directory of the baselines.
+    :param threshold: Minimum similarity for a capture to pass.
+    :param update: Replace the baselines with the new captures instead of comparing.
+    """
+
+    def __init__(self, baseline_dir=DEFAULT_BASELINE_DIR, threshold=DEFAULT_THRESHOLD, update=False):
+        self.baseline_dir = baseline_dir
+        self.threshold = threshold
+        self.update = update
+        self._lock = threading.Lock()
+
+    def path_for(self, browser, name):
+        return os.path.join(self.baseline_dir, browser, f"{name}.png")
+
+    def check(self, browser, name, capture_png, masks=()):
+        """
+        Compare a capture with its baseline, creating or replacing the baseline when needed.
+
+        :return: Result of compare() plus 'passed', 'baseline' (path) and 'baseline_created'; a new
+                 baseline only has the last three keys.
+        """
+        path = self.path_for(browser, name)
+        with self._lock:
+            if self.update or not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as file:
+                    file.write(capture_png)
+                return {"baseline_created": True, "baseline": path, "passed": True}
+            with open(path, "rb") as file:
+                baseline_png = file.read()
+        result = compare(baseline_png, capture_png, masks, threshold=self.threshold)
+        result.update(baseline=path, baseline_created=False,
+                      passed=(result["stage"] != "layout" and result["similarity"] >= self.threshold
+                              and not result["size_changed"]))
+        return result
+
+
+def configure(enabled=False, baseline_dir=DEFAULT_BASELINE_DIR, threshold=DEFAULT_THRESHOLD, update=False):
+    """Enable visual regression for this process (requires NumPy and Pillow)."""
+    global _store
+    if enabled and not is_available():
+        raise RuntimeError("Visual regression requires the numpy and Pillow packages")
+    _store = BaselineStore(baseline_dir, threshold, update) if enabled else None
+    return _store
+
+
+def get_store():
+    """Return the baseline store, or None when visual regression is disabled."""
+    return _store
@@ -0,0 +1,165 @@
+"""
+Event-driven wait engine.
+
+Waits are resolved inside the page: a single async script installs a MutationObserver (backed by
+a cheap in-page re-check for style-only changes such as :hover) and returns as soon as one of the
+locators matches, so there is one WebDriver round trip per wait instead of one per poll. When the
+script cannot be used (e.g. the page navigates away while waiting) the engine falls back to
+adaptive polling that starts fast and backs off.
+"""
+import time
+
+from selenium.common.exceptions import (NoSuchWindowException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+
+# Adaptive polling: first interval, growth factor and upper bound (in seconds)
+POLL_START = 0.05
+POLL_FACTOR = 1.5
+POLL_MAX = 0.5
+
+# Async script used by wait_for_any. Arguments: [[kind, value], ...] with kind 'css' or 'xpath',
+# visible only (bool), timeout (ms). Resolves with {index, element} for the first match, or null.
+WAIT_FOR_ANY_SCRIPT = """
+const [locators, visibleOnly, timeoutMs, done] = arguments;
+let finished = false;
+
+function find(kind, value) {
+    if (kind === 'css') return Array.from(document.querySelectorAll(value));
+    const snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: snapshot.snapshotLength}, (_, i) => snapshot.snapshotItem(i));
+}
+
+function isVisible(element) {
+    if (!element.isConnected) return false;
+    const style = window.getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') return false;
+    return Array.from(element.getClientRects()).some(rect => rect.width > 0 && rect.height > 0);
+}
+
+function check() {
+    if (finished) return;
+    for (let index = 0; index < locators.length; index++) {
+        const element = find(locators[index][0], locators[index][1]).find(e => !visibleOnly || isVisible(e));
+        if (element) return finish({index, element});
+    }
+}
+
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(fallback);
+    clearTimeout(deadline);
+    done(result);
+}
+
+const observer = new MutationObserver(check);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+// Style-only changes (CSS :hover, transitions) do not mutate the DOM: re-check in-page as well
+const fallback = setInterval(check, 100);
+const deadline = setTimeout(() => finish(null), timeoutMs);
+check();
+"""
+
+
+def to_script_locator(locator):
+    """
+    Translate a Selenium (By, value) locator into a ('css' | 'xpath', value) pair for the wait script.
+    """
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.ID:
+        return ["css", f'[id="{value}"]']
+    if by == By.NAME:
+        return ["css", f'[name="{value}"]']
+    if by == By.CLASS_NAME:
+        return ["css", f".{value}"]
+    if by == By.TAG_NAME:
+        return ["css", value]
+    if by == By.LINK_TEXT:
+        return ["xpath", f'//a[normalize-space(.)="{value}"]']
+    if by == By.PARTIAL_LINK_TEXT:
+        return ["xpath", f'//a[contains(., "{value}")]']
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def ensure_script_timeout(driver, seconds):
+    """
+    Make sure the session's script timeout is at least `seconds`.
+
+    The value is cached on the driver so the timeout command is only sent when it has to grow.
+    """
+    if getattr(driver, "_script_timeout", 0) < seconds:
+        driver.set_script_timeout(seconds)
+        driver._script_timeout = seconds
+
+
+def wait_for_any(driver, locators, timeout=10, visible=True):
+    """
+    Wait until any of the locators matches an element.
+
+    :param driver: WebDriver instance.
+    :param locators: List of (By, value) locators.
+    :param timeout: Maximum wait time (in seconds).
+    :param visible: Require the element to be visible, not only present in the DOM.
+    :return: Tuple (index of the locator that fired first, WebElement).
+    :raises TimeoutException: If no locator matched within the timeout.
+    """
+    started = time.monotonic()
+    try:
+        ensure_script_timeout(driver, timeout + 5)
+        result = driver.execute_async_script(
+            WAIT_FOR_ANY_SCRIPT, [to_script_locator(locator) for locator in locators], visible, int(timeout * 1000)
+        )
+    except (TimeoutException, NoSuchWindowException):
+        raise
+    except WebDriverException:
+        # The page navigated or the script could not run: fall back to polling for the remaining time
+        return poll_for_any(driver, locators, timeout - (time.monotonic() - started), visible)
+
+    if result is None:
+        raise TimeoutException(f"None of the locators {locators} matched within {timeout} seconds.")
+    return result["index"], result["element"]
+
+
+def poll_for_any(driver, locators, timeout=10, visible=True):
+    """
+    Adaptive polling fallback for wait_for_any: polls quickly at first and backs off up to POLL_MAX.
+    """
+    def match(d):
+        for index, locator in enumerate(locators):
+            for element in d.find_elements(*locator):
+                try:
+                    if not visible or element.is_displayed():
+                        return index, element
+                except StaleElementReferenceException:
+                    continue
+        return None
+
+    return wait_until(driver, match, timeout, f"None of the locators {locators} matched within {timeout} seconds.")
+
+
+def wait_until(driver, condition, timeout=10, message=""):
+    """
+    Poll `condition(driver)` with adaptive intervals until it returns a truthy value.
+
+    Used for conditions that cannot be observed from inside the page (e.g. new windows opening).
+
+    :return: The truthy value returned by the condition.
+    :raises TimeoutException: If the condition is still falsy after `timeout` seconds.
+    """
+    deadline = time.monotonic() + max(timeout, 0)
+    interval = POLL_START
+    while True:
+        value = condition(driver)
+        if value:
+            return value
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(message)
+        time.sleep(min(interval, remaining))
+        interval = min(interval * POLL_FACTOR, POLL_MAX)